@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for tailored resume versions
+
+Drafts are split into sections and every section is stored once, zlib-compressed, under
+its SHA-256, so drafts that share most of their content cost little extra space. Rendered
+PDFs are keyed by the Markdown hash and the stylesheet they were rendered with, so the same
+Markdown is never rendered twice. A SQLite index records each version with its job
+description, Match Score and date for querying.
+"""
+
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+import argparse
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import List, Optional
+from models import ArtifactVersion
+from pdf_renderer import STYLESHEETS
+
+DEFAULT_STORE = ".artifacts"
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def split_chunks(markdown_text: str) -> List[str]:
+    """Split Markdown at headings so that "".join(chunks) reproduces it exactly."""
+    chunks, current = [], []
+    for line in markdown_text.splitlines(keepends=True):
+        if line.startswith("#") and current:
+            chunks.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class ArtifactStore:
+    """Deduplicated Markdown and PDF artifacts with a small query API."""
+
+    def __init__(self, root: str = DEFAULT_STORE):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS drafts (
+                    markdown_hash TEXT PRIMARY KEY,
+                    recipe_hash TEXT NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS pdfs (
+                    markdown_hash TEXT NOT NULL,
+                    style_hash TEXT NOT NULL,
+                    pdf_hash TEXT NOT NULL,
+                    PRIMARY KEY (markdown_hash, style_hash)
+                );
+                CREATE TABLE IF NOT EXISTS versions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    jd_path TEXT NOT NULL,
+                    jd_hash TEXT NOT NULL,
+                    score INTEGER,
+                    markdown_hash TEXT NOT NULL,
+                    output_path TEXT,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS versions_jd ON versions (jd_hash);
+                CREATE INDEX IF NOT EXISTS versions_created ON versions (created_at);
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation keeps the store safe to use from worker threads
+        conn = sqlite3.connect(os.path.join(self.root, "index.db"), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Objects
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest[2:])
+
+    def put_object(self, data: bytes) -> str:
+        """Store bytes once under their hash; returns the hash."""
+        digest = sha256(data)
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(data, 9))
+            os.replace(tmp_path, path)
+        return digest
+
+    def get_object(self, digest: str) -> bytes:
+        with open(self._object_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    # Markdown
+
+    def put_markdown(self, markdown_text: str) -> str:
+        """Store a draft as a recipe of deduplicated section chunks; returns its hash."""
+        data = markdown_text.encode("utf-8")
+        markdown_hash = sha256(data)
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM drafts WHERE markdown_hash = ?", (markdown_hash,)).fetchone():
+                return markdown_hash
+        chunks = [self.put_object(chunk.encode("utf-8")) for chunk in split_chunks(markdown_text)]
+        recipe_hash = self.put_object(json.dumps(chunks).encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO drafts VALUES (?, ?, ?)", (markdown_hash, recipe_hash, len(data)))
+        return markdown_hash
+
+    def get_markdown(self, markdown_hash: str) -> str:
+        with self._connect() as conn:
+            row = conn.execute("SELECT recipe_hash FROM drafts WHERE markdown_hash = ?", (markdown_hash,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown draft: {markdown_hash}")
+        chunks = json.loads(self.get_object(row[0]))
+        return "".join(self.get_object(chunk).decode("utf-8") for chunk in chunks)
+
+    # PDFs
+
+    @staticmethod
+    def style_hash(stylesheet: str) -> str:
+        """Changing a stylesheet's CSS invalidates PDFs rendered with it."""
+        return sha256(f"{stylesheet}\n{STYLESHEETS.get(stylesheet, '')}".encode("utf-8"))
+
+    def put_pdf(self, markdown_text: str, pdf_path: str, stylesheet: str = "executive") -> str:
+        markdown_hash = self.put_markdown(markdown_text)
+        with open(pdf_path, 'rb') as f:
+            pdf_hash = self.put_object(f.read())
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO pdfs VALUES (?, ?, ?)",
+                         (markdown_hash, self.style_hash(stylesheet), pdf_hash))
+        return pdf_hash
+
+    def export_pdf(self, markdown_text: str, output_path: str, stylesheet: str = "executive") -> bool:
+        """Write a previously rendered PDF for this Markdown to ``output_path``, if there is one."""
+        markdown_hash = sha256(markdown_text.encode("utf-8"))
+        with self._connect() as conn:
+            row = conn.execute("SELECT pdf_hash FROM pdfs WHERE markdown_hash = ? AND style_hash = ?",
+                               (markdown_hash, self.style_hash(stylesheet))).fetchone()
+        if row is None or not os.path.exists(self._object_path(row[0])):
+            return False
+        with open(output_path, 'wb') as f:
+            f.write(self.get_object(row[0]))
+        return True
+
+    # Versions
+
+    _VERSION_FIELDS = ["id", "jd_path", "jd_hash", "score", "markdown_hash", "output_path", "created_at"]
+    _SELECT_VERSIONS = f"SELECT {', '.join(_VERSION_FIELDS)} FROM versions WHERE 1 = 1"
+
+    def _version(self, row) -> ArtifactVersion:
+        return ArtifactVersion(**dict(zip(self._VERSION_FIELDS, row)))
+
+    def record_version(self, jd_path: str, jd_text: str, markdown_text: str,
+                       score: Optional[int] = None, output_path: Optional[str] = None) -> int:
+        """Index a tailored version; returns its id."""
+        markdown_hash = self.put_markdown(markdown_text)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO versions (jd_path, jd_hash, score, markdown_hash, output_path, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (jd_path, sha256(jd_text.encode("utf-8")), score, markdown_hash, output_path,
+                 datetime.now(timezone.utc).isoformat())
+            )
+            return cursor.lastrowid
+
+    def get_version(self, version_id: int) -> Optional[ArtifactVersion]:
+        with self._connect() as conn:
+            row = conn.execute(f"{self._SELECT_VERSIONS} AND id = ?", (version_id,)).fetchone()
+        return self._version(row) if row else None
+
+    def find_versions(self, jd: Optional[str] = None, min_score: Optional[int] = None,
+                      since: Optional[str] = None, until: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[ArtifactVersion]:
+        """Versions newest first. ``jd`` matches a JD hash or part of its path; dates are ISO-8601."""
+        query = self._SELECT_VERSIONS
+        params = []
+        if jd:
+            query += " AND (jd_hash = ? OR jd_path LIKE ?)"
+            params += [jd, f"%{jd}%"]
+        if min_score is not None:
+            query += " AND score >= ?"
+            params.append(min_score)
+        if since:
+            query += " AND created_at >= ?"
+            params.append(since)
+        if until:
+            query += " AND created_at < ?"
+            params.append(until)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [self._version(row) for row in rows]
+
+    def stats(self) -> dict:
+        """Logical Markdown size versus bytes actually on disk."""
+        stored = objects = 0
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, "objects")):
+            for name in filenames:
+                objects += 1
+                stored += os.path.getsize(os.path.join(dirpath, name))
+        with self._connect() as conn:
+            versions = conn.execute("SELECT COUNT(*) FROM versions").fetchone()[0]
+            logical = conn.execute(
+                "SELECT COALESCE(SUM(d.size), 0) FROM versions v JOIN drafts d USING (markdown_hash)"
+            ).fetchone()[0]
+            pdfs = conn.execute("SELECT COUNT(*) FROM pdfs").fetchone()[0]
+        return {"versions": versions, "pdfs": pdfs, "objects": objects,
+                "markdown_bytes": logical, "stored_bytes": stored}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the tailored resume artifact store")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="Artifact store directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List stored versions")
+    list_parser.add_argument("--jd", help="Job description path fragment or hash")
+    list_parser.add_argument("--min-score", type=int, help="Minimum Match Score")
+    list_parser.add_argument("--since", help="Only versions on or after this date (YYYY-MM-DD)")
+    list_parser.add_argument("--until", help="Only versions before this date (YYYY-MM-DD)")
+    list_parser.add_argument("--limit", type=int, help="Maximum number of versions")
+
+    export_parser = subparsers.add_parser("export", help="Write a stored version's Markdown")
+    export_parser.add_argument("version", type=int, help="Version id")
+    export_parser.add_argument("-o", "--output", required=True, help="Output .md path")
+
+    subparsers.add_parser("stats", help="Show deduplication statistics")
+
+    args = parser.parse_args()
+    store = ArtifactStore(args.store)
+
+    if args.command == "list":
+        for version in store.find_versions(args.jd, args.min_score, args.since, args.until, args.limit):
+            print(f"{version.id:>5}  {version.created_at[:19]}  score {version.score}  {version.jd_path}")
+    elif args.command == "export":
+        version = store.get_version(args.version)
+        if version is None:
+            print(f"❌ No version {args.version}")
+        else:
+            with open(args.output, 'w') as f:
+                f.write(store.get_markdown(version.markdown_hash))
+            print(f"✓ Exported version {args.version} to {args.output}")
+    else:
+        print(json.dumps(store.stats(), indent=2))
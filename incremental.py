@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Incremental re-tailoring when the master resume changes
+
+A manifest records, for every tailored output, the hash of each section of the source
+resume and the job description it was built from. Job analyses are cached by JD content
+hash. On refresh, only outputs whose sections changed are touched: a changed role is
+rewritten in place in the tailored Markdown, and structural changes fall back to a full
+re-run that reuses the cached analysis.
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from models import JobAnalysis
+
+DEFAULT_MANIFEST = ".tailor_manifest.json"
+
+# Plain-text headings that start a new top-level section of a resume
+SECTION_HEADINGS = {
+    "summary", "professional summary", "experience", "professional experience", "work experience",
+    "additional experience", "education", "skills", "key skills", "technical skills",
+    "certifications", "projects", "publications", "awards",
+}
+
+# "January 2024 - December 2025", "Title | 2020 - Present", "December 2025 – Present"
+DATE_RANGE = re.compile(r"\b(19|20)\d{2}\b.*[-–—].*\b((19|20)\d{2}|present)\b", re.IGNORECASE)
+
+
+def content_hash(text: str) -> str:
+    """Hash text ignoring trailing whitespace, so re-saved files do not look changed."""
+    normalized = "\n".join(line.rstrip() for line in text.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split a resume into (name, text) sections.
+
+    Markdown is split on headings. Plain text is split on known section headings and on
+    role starts, i.e. a line followed by a date range line. Anything before the first
+    section is named ``header``.
+    """
+    lines = text.splitlines()
+    is_markdown = any(line.startswith("#") for line in lines)
+    starts = []
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if is_markdown:
+            if stripped.startswith("#"):
+                starts.append(i)
+        elif stripped.lower() in SECTION_HEADINGS:
+            starts.append(i)
+        elif i + 1 < len(lines) and DATE_RANGE.search(lines[i + 1]) and not DATE_RANGE.search(line):
+            starts.append(i)
+
+    sections = []
+    seen = {}
+    if not starts or starts[0] > 0:
+        sections.append(("header", "\n".join(lines[:starts[0] if starts else len(lines)])))
+    for n, start in enumerate(starts):
+        end = starts[n + 1] if n + 1 < len(starts) else len(lines)
+        name = lines[start].strip().lstrip("#").strip()
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name} ({seen[name]})"
+        sections.append((name, "\n".join(lines[start:end])))
+    return sections
+
+
+def section_hashes(text: str) -> Dict[str, str]:
+    return {name: content_hash(body) for name, body in split_sections(text)}
+
+
+def diff_sections(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    """Compare two section hash maps."""
+    return {
+        "added": [name for name in new if name not in old],
+        "removed": [name for name in old if name not in new],
+        "changed": [name for name in new if name in old and old[name] != new[name]],
+    }
+
+
+def _section_key(name: str) -> str:
+    """'Imply – Burlingame, CA' -> 'imply', used to find a role in the tailored Markdown."""
+    return re.split(r"\s[-–—|]\s|,|\(", name, maxsplit=1)[0].strip().lower()
+
+
+def _strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip("\n")
+
+
+def find_section(sections: List[Tuple[str, str]], source_name: str) -> Optional[int]:
+    """Index of the tailored section for a source section, or None if not uniquely found."""
+    key = _section_key(source_name)
+    matches = [i for i, (name, _) in enumerate(sections) if name != "header" and key and key in name.lower()]
+    return matches[0] if len(matches) == 1 else None
+
+
+def replace_section(markdown_text: str, source_name: str, new_section: str) -> Optional[str]:
+    """Swap the tailored section matching ``source_name``; None if it is not uniquely found."""
+    sections = split_sections(markdown_text)
+    index = find_section(sections, source_name)
+    if index is None:
+        return None
+    sections[index] = (sections[index][0], _strip_code_fence(new_section))
+    return "\n".join(body for _, body in sections)
+
+
+class TailorManifest:
+    """JSON manifest of tailored outputs and cached job analyses."""
+
+    def __init__(self, path: str = DEFAULT_MANIFEST):
+        self.path = path
+        self.data = {"version": 1, "analyses": {}, "outputs": {}}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.data = json.load(f)
+
+    def save(self):
+        """Write atomically so an interrupted refresh never corrupts the manifest."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get_analysis(self, jd_hash: str) -> Optional[JobAnalysis]:
+        cached = self.data["analyses"].get(jd_hash)
+        return JobAnalysis.model_validate(cached) if cached else None
+
+    def put_analysis(self, jd_hash: str, analysis: JobAnalysis):
+        self.data["analyses"][jd_hash] = analysis.model_dump()
+
+    def outputs(self) -> Dict[str, dict]:
+        return self.data["outputs"]
+
+    def record_output(self, output_path: str, resume_path: str, jd_path: str, jd_hash: str,
+                      markdown_path: str, sections: Dict[str, str], best_score: Optional[int] = None):
+        self.data["outputs"][output_path] = {
+            "resume_path": resume_path,
+            "jd_path": jd_path,
+            "jd_hash": jd_hash,
+            "markdown_path": markdown_path,
+            "sections": sections,
+            "best_score": best_score,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+
+class IncrementalTailor:
+    """Tailors resumes through a ResumeTailor while keeping the manifest up to date."""
+
+    def __init__(self, tailor, manifest_path: str = DEFAULT_MANIFEST, max_section_updates: int = 3):
+        self.tailor = tailor
+        self.manifest = TailorManifest(manifest_path)
+        self.max_section_updates = max_section_updates
+
+    def _read_resume(self, resume_path: str) -> str:
+        if resume_path.lower().endswith('.pdf'):
+            return self.tailor.read_pdf(resume_path)
+        with open(resume_path, 'r') as f:
+            return f.read()
+
+    def _analysis_for(self, jd_text: str) -> Tuple[str, JobAnalysis]:
+        jd_hash = content_hash(jd_text)
+        analysis = self.manifest.get_analysis(jd_hash)
+        if analysis is None:
+            print("🔍 Analyzing Job Description...")
+            analysis = self.tailor.analyze_job_description(jd_text)
+            self.manifest.put_analysis(jd_hash, analysis)
+            self.manifest.save()
+        return jd_hash, analysis
+
+    def tailor_output(self, resume_path: str, jd_path: str, output_path: str,
+                      analysis: Optional[JobAnalysis] = None) -> Optional[str]:
+        """Full tailoring run that records the output in the manifest."""
+        resume_text = self._read_resume(resume_path)
+        with open(jd_path, 'r') as f: jd_text = f.read()
+        if analysis is None:
+            jd_hash, analysis = self._analysis_for(jd_text)
+        else:
+            jd_hash = content_hash(jd_text)
+            self.manifest.put_analysis(jd_hash, analysis)
+
+        best_resume = self.tailor.run_workflow(resume_path, jd_path, output_path,
+                                               interactive=False, analysis=analysis)
+        if best_resume is None:
+            return None
+
+        markdown_path = os.path.splitext(output_path)[0] + ".md"
+        with open(markdown_path, 'w') as f: f.write(best_resume)
+        best_score = self.tailor.last_result.best_score if self.tailor.last_result else None
+        self.manifest.record_output(output_path, resume_path, jd_path, jd_hash, markdown_path,
+                                    section_hashes(resume_text), best_score)
+        self.manifest.save()
+        return best_resume
+
+    def _patch_sections(self, output_path: str, entry: dict, resume_text: str, jd_text: str,
+                        changed: List[str], analysis: JobAnalysis) -> bool:
+        """Rewrite only the changed roles in the tailored Markdown. False if a full run is needed.
+
+        The patched resume is scored again so the manifest never keeps a stale Match Score.
+        """
+        if not os.path.exists(entry["markdown_path"]) or "header" in changed:
+            return False
+        with open(entry["markdown_path"], 'r') as f: markdown_text = f.read()
+
+        source = dict(split_sections(resume_text))
+        tailored = split_sections(markdown_text)
+        if any(find_section(tailored, name) is None for name in changed):
+            return False
+
+        for name in changed:
+            print(f"   ✏️  Rewriting section: {name}")
+            current = tailored[find_section(tailored, name)][1]
+            rewritten = self.tailor.tailor_section(source[name], current, analysis)
+            markdown_text = replace_section(markdown_text, name, rewritten)
+            tailored = split_sections(markdown_text)
+
+        with open(entry["markdown_path"], 'w') as f: f.write(markdown_text)
+        try:
+            best_score = self.tailor.reflect_on_resume(markdown_text, jd_text).match_score
+            print(f"   Match Score: {best_score}/100")
+        except Exception as e:
+            print(f"   ⚠️  Could not score the patched resume: {e}")
+            best_score = None
+
+        self.tailor.generate_pdf(markdown_text, output_path)
+        if self.tailor.artifact_store is not None:
+            self.tailor.artifact_store.record_version(entry["jd_path"], jd_text, markdown_text, best_score, output_path)
+        self.manifest.record_output(output_path, entry["resume_path"], entry["jd_path"], entry["jd_hash"],
+                                    entry["markdown_path"], section_hashes(resume_text), best_score)
+        self.manifest.save()
+        return True
+
+    def refresh(self, resume_path: str) -> Dict[str, List[str]]:
+        """Bring every output built from ``resume_path`` up to date with the current resume."""
+        resume_text = self._read_resume(resume_path)
+        current = section_hashes(resume_text)
+        report = {"unchanged": [], "patched": [], "regenerated": [], "failed": []}
+
+        for output_path, entry in list(self.manifest.outputs().items()):
+            if os.path.abspath(entry["resume_path"]) != os.path.abspath(resume_path):
+                continue
+            if not os.path.exists(entry["jd_path"]):
+                print(f"⚠️  {entry['jd_path']} no longer exists, skipping {output_path}")
+                report["failed"].append(output_path)
+                continue
+            with open(entry["jd_path"], 'r') as f: jd_text = f.read()
+            jd_hash, analysis = self._analysis_for(jd_text)
+            diff = diff_sections(entry["sections"], current)
+
+            if jd_hash == entry["jd_hash"] and not any(diff.values()):
+                report["unchanged"].append(output_path)
+                continue
+
+            print(f"\n🔄 Refreshing {output_path}: {json.dumps(diff)}")
+            try:
+                if (jd_hash == entry["jd_hash"] and not diff["added"] and not diff["removed"]
+                        and len(diff["changed"]) <= self.max_section_updates
+                        and self._patch_sections(output_path, entry, resume_text, jd_text, diff["changed"], analysis)):
+                    report["patched"].append(output_path)
+                elif self.tailor_output(resume_path, entry["jd_path"], output_path, analysis) is not None:
+                    report["regenerated"].append(output_path)
+                else:
+                    report["failed"].append(output_path)
+            except Exception as e:
+                print(f"❌ Error refreshing {output_path}: {e}")
+                report["failed"].append(output_path)
+
+        return report
+
+
+if __name__ == "__main__":
+    from resume_tailor import ResumeTailor
+
+    parser = argparse.ArgumentParser(description="Incrementally tailor resumes against a manifest")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="Manifest path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    tailor_parser = subparsers.add_parser("tailor", help="Tailor a resume and record it in the manifest")
+    tailor_parser.add_argument("resume", help="Path to master resume (.txt)")
+    tailor_parser.add_argument("job", help="Path to job description (.txt)")
+    tailor_parser.add_argument("-o", "--output", default="tailored_resume.pdf", help="Output PDF name")
+
+    refresh_parser = subparsers.add_parser("refresh", help="Update outputs after the master resume changed")
+    refresh_parser.add_argument("resume", help="Path to master resume (.txt)")
+
+    args = parser.parse_args()
+
+    try:
+        incremental = IncrementalTailor(ResumeTailor(), args.manifest)
+        if args.command == "tailor":
+            if incremental.tailor_output(args.resume, args.job, args.output) is not None:
+                print(f"\n✨ Successfully created: {args.output}")
+        else:
+            report = incremental.refresh(args.resume)
+            print(f"\n📊 Refresh summary: {json.dumps({k: len(v) for k, v in report.items()})}")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
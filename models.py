@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Dict, List, Optional
 
 class JobAnalysis(BaseModel):
     responsibilities: List[str] = Field(description="Top 5-7 key responsibilities")
@@ -8,8 +8,58 @@ class JobAnalysis(BaseModel):
     experience_requirements: str = Field(description="Required years/level of experience")
     success_metrics: List[str] = Field(description="Quantifiable metrics mentioned")
 
+class SourcedJobAnalysis(BaseModel):
+    source_id: str = Field(description="The id of the job description this analysis belongs to, exactly as given")
+    analysis: JobAnalysis = Field(description="Analysis of that job description")
+
+class JobAnalysisBatch(BaseModel):
+    analyses: List[SourcedJobAnalysis] = Field(description="One analysis per job description, in input order")
+
 class ReflectionCritique(BaseModel):
     match_score: int = Field(description="Score from 0-100 on how well the resume matches the JD")
     critique_points: List[str] = Field(description="Specific areas where the resume is weak or missing keywords")
     hallucination_check: bool = Field(description="True if the LLM added experience not found in the original resume")
-    needs_revision: bool = Field(description="Whether a second pass is required to improve the resume")
\ No newline at end of file
+    needs_revision: bool = Field(description="Whether a second pass is required to improve the resume")
+
+class RefinementPolicy(BaseModel):
+    max_iterations: int = Field(default=2, ge=1, description="Maximum number of reflection passes per resume")
+    target_score: Optional[int] = Field(default=90, ge=0, le=100, description="Stop refining once a draft reaches this Match Score")
+    min_improvement: int = Field(default=3, ge=0, description="Stop when a refinement gains fewer points than this over the best score")
+    warning_threshold: int = Field(default=70, ge=0, le=100, description="Scores below this prompt the user to continue or stop")
+    max_seconds: Optional[float] = Field(default=None, gt=0, description="Wall-clock budget per resume, in seconds")
+    max_tokens: Optional[int] = Field(default=None, gt=0, description="Total LLM token budget per resume")
+
+class WorkflowResult(BaseModel):
+    best_score: int = Field(description="Highest Match Score reached by any draft")
+    scores: List[int] = Field(description="Match Score of each reflection pass, in order")
+    iterations: int = Field(description="Number of reflection passes performed")
+    stop_reason: str = Field(description="Why the refinement loop stopped")
+    elapsed_seconds: float = Field(description="Wall-clock time spent on the resume")
+    tokens_used: int = Field(description="Total LLM tokens spent on the resume")
+    critique_points: List[str] = Field(default_factory=list, description="Critique points of the best-scoring draft")
+    timings: Dict[str, float] = Field(default_factory=dict, description="Seconds spent in each workflow stage")
+    budget_exceeded: Optional[str] = Field(default=None, description="time_budget or token_budget if the run overshot a budget")
+
+class BatchRecord(BaseModel):
+    jd_path: str = Field(description="Job description the resume was tailored to")
+    output_path: Optional[str] = Field(default=None, description="PDF written for this job, if any")
+    status: str = Field(description="ok, stopped or error")
+    error: Optional[str] = Field(default=None, description="Error message when status is error")
+    best_score: Optional[int] = Field(default=None, description="Highest Match Score reached")
+    scores: List[int] = Field(default_factory=list, description="Match Score of each reflection pass")
+    critique_points: List[str] = Field(default_factory=list, description="Critique points of the best-scoring draft")
+    stop_reason: Optional[str] = Field(default=None, description="Why the refinement loop stopped")
+    timings: Dict[str, float] = Field(default_factory=dict, description="Seconds spent in each workflow stage")
+    budget_exceeded: Optional[str] = Field(default=None, description="time_budget or token_budget if the job overshot a budget")
+    elapsed_seconds: float = Field(description="Wall-clock time spent on this job")
+    tokens_used: int = Field(default=0, description="Total LLM tokens spent on this job")
+    finished_at: str = Field(description="UTC ISO-8601 timestamp when the job finished")
+
+class ArtifactVersion(BaseModel):
+    id: int = Field(description="Version id in the artifact store")
+    jd_path: str = Field(description="Job description the version was tailored to")
+    jd_hash: str = Field(description="SHA-256 of the job description text")
+    score: Optional[int] = Field(default=None, description="Best Match Score of the version")
+    markdown_hash: str = Field(description="SHA-256 of the tailored Markdown")
+    output_path: Optional[str] = Field(default=None, description="PDF path written for the version")
+    created_at: str = Field(description="UTC ISO-8601 timestamp when the version was stored")
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+PDF rendering for tailored resumes, with an optional warm renderer daemon
+
+Starting WeasyPrint cold (native libraries, fontconfig, stylesheet parsing) dominates the
+cost of rendering a two-page resume. Run this module as a long-lived process:
+
+    python pdf_renderer.py
+
+and render_pdf() will hand documents to it over a Unix socket, falling back to rendering
+in-process when the daemon is not running.
+"""
+
+import os
+import json
+import stat
+import errno
+import socket
+import argparse
+import tempfile
+import threading
+import socketserver
+import markdown
+
+# Executive layout used by resume_tailor.py
+EXECUTIVE_CSS = """
+@page {
+    size: letter;
+    margin: 0.5in 0.65in;
+    @bottom-right {
+        content: counter(page);
+        font-size: 9pt;
+        color: #999;
+    }
+}
+body {
+    font-family: 'Helvetica', 'Arial', sans-serif;
+    font-size: 10pt;
+    line-height: 1.4;
+    color: #333;
+}
+h1 {
+    font-size: 24pt;
+    color: #1a1a1a;
+    margin-bottom: 2pt;
+    text-align: center;
+    text-transform: uppercase;
+    letter-spacing: 2px;
+    font-weight: 300;
+}
+/* Contact Line */
+h1 + p {
+    text-align: center;
+    font-size: 8.5pt;
+    color: #555;
+    margin-bottom: 25pt;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    border-bottom: 1px solid #eee;
+    padding-bottom: 10pt;
+}
+h2 {
+    font-size: 12pt;
+    color: #2c5aa0;
+    border-bottom: 1.5pt solid #2c5aa0;
+    text-transform: uppercase;
+    margin-top: 20pt;
+    margin-bottom: 10pt;
+    font-weight: bold;
+    letter-spacing: 1px;
+}
+h3 {
+    font-size: 11pt;
+    font-weight: bold;
+    margin-top: 12pt;
+    margin-bottom: 0;
+    color: #1a1a1a;
+}
+/* Date and Location line */
+h3 + p {
+    font-style: italic;
+    color: #4a5568;
+    font-size: 9pt;
+    margin-top: 0;
+    margin-bottom: 6pt;
+}
+ul {
+    margin-top: 0;
+    margin-bottom: 8pt;
+    padding-left: 15pt;
+}
+li {
+    margin-bottom: 3pt;
+    text-align: justify;
+}
+strong {
+    color: #2d3748;
+    font-weight: 600;
+}
+"""
+
+# Classic layout used by convert_to_pdf.py
+CLASSIC_CSS = """
+@page {
+    size: letter;
+    margin: 0.5in;
+}
+
+body {
+    font-family: 'Helvetica', 'Arial', sans-serif;
+    font-size: 10pt;
+    line-height: 1.4;
+    color: #202020;
+    max-width: 100%;
+}
+
+h1 {
+    font-size: 24pt;
+    font-weight: bold;
+    margin: 0 0 5pt 0;
+    padding: 0;
+    color: #1a1a1a;
+    letter-spacing: 0.5pt;
+}
+
+h2 {
+    font-size: 13pt;
+    font-weight: bold;
+    margin: 16pt 0 8pt 0;
+    padding-bottom: 4pt;
+    border-bottom: 2pt solid #2c5aa0;
+    color: #2c5aa0;
+    text-transform: uppercase;
+    letter-spacing: 0.5pt;
+}
+
+h3 {
+    font-size: 11pt;
+    font-weight: bold;
+    margin: 10pt 0 4pt 0;
+    color: #1a1a1a;
+}
+
+h4 {
+    font-size: 10pt;
+    font-weight: bold;
+    font-style: italic;
+    margin: 6pt 0 4pt 0;
+    color: #404040;
+}
+
+p {
+    margin: 0 0 8pt 0;
+    text-align: justify;
+}
+
+ul {
+    margin: 4pt 0 8pt 0;
+    padding-left: 18pt;
+}
+
+li {
+    margin: 3pt 0;
+}
+
+strong {
+    font-weight: bold;
+    color: #1a1a1a;
+}
+
+em {
+    font-style: italic;
+    color: #404040;
+}
+
+hr {
+    border: none;
+    border-top: 1pt solid #cccccc;
+    margin: 10pt 0;
+}
+
+/* Contact info styling */
+body > p:first-of-type {
+    text-align: center;
+    font-size: 9pt;
+    color: #404040;
+    margin: 0 0 10pt 0;
+}
+
+/* Professional summary box */
+h2:first-of-type + p {
+    background-color: #f5f5f5;
+    padding: 10pt;
+    border-left: 3pt solid #2c5aa0;
+    margin-bottom: 10pt;
+}
+
+/* Core competencies styling */
+h2 + p strong {
+    display: block;
+    margin-bottom: 4pt;
+}
+
+/* Tighten spacing for experience sections */
+h3 + p {
+    margin-bottom: 4pt;
+}
+
+h4 + p {
+    margin-bottom: 6pt;
+}
+
+/* Achievement bullets */
+ul li strong:first-child {
+    color: #2c5aa0;
+}
+
+/* Education section */
+body > h2:nth-last-of-type(4) ~ * {
+    page-break-inside: avoid;
+}
+
+/* Prevent orphans and widows */
+h2, h3, h4 {
+    page-break-after: avoid;
+}
+
+li {
+    page-break-inside: avoid;
+}
+
+/* Link styling */
+a {
+    color: #2c5aa0;
+    text-decoration: none;
+}
+"""
+
+STYLESHEETS = {"executive": EXECUTIVE_CSS, "classic": CLASSIC_CSS}
+
+
+def default_socket_path() -> str:
+    """Socket path from RESUME_RENDERER_SOCKET, else in $XDG_RUNTIME_DIR, else in a per-user
+    directory under the temp directory that the daemon creates with mode 0700."""
+    if os.getenv("RESUME_RENDERER_SOCKET"):
+        return os.getenv("RESUME_RENDERER_SOCKET")
+    if os.getenv("XDG_RUNTIME_DIR"):
+        return os.path.join(os.getenv("XDG_RUNTIME_DIR"), "resume_renderer.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"resume_renderer-{uid}", "renderer.sock")
+
+
+def is_own_socket(path: str) -> bool:
+    """True if ``path`` is a socket owned by the current user, so resumes are never sent to
+    a socket another local user planted at the expected path."""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid()
+
+
+def _file_signature(path: str):
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_ino, info.st_size, info.st_mtime_ns
+
+
+def markdown_to_html(markdown_content: str, title: str = "") -> str:
+    """Convert Markdown to a complete HTML document."""
+    html_content = markdown.markdown(markdown_content, extensions=['extra', 'nl2br'])
+    title_tag = f"<title>{title}</title>" if title else ""
+    return f'<!DOCTYPE html><html><head><meta charset="utf-8">{title_tag}</head><body>{html_content}</body></html>'
+
+
+class WarmRenderer:
+    """Keeps WeasyPrint, the font configuration and parsed stylesheets loaded between renders."""
+
+    def __init__(self):
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.font_config = FontConfiguration()
+        self.stylesheets = {
+            name: CSS(string=css, font_config=self.font_config) for name, css in STYLESHEETS.items()
+        }
+
+    def render(self, markdown_content: str, output_path, stylesheet: str = "executive", title: str = ""):
+        """Render Markdown to ``output_path``; returns the PDF bytes when ``output_path`` is None."""
+        from weasyprint import HTML
+
+        if stylesheet not in self.stylesheets:
+            raise ValueError(f"Unknown stylesheet: {stylesheet}")
+        return HTML(string=markdown_to_html(markdown_content, title)).write_pdf(
+            output_path,
+            stylesheets=[self.stylesheets[stylesheet]],
+            font_config=self.font_config
+        )
+
+
+_renderer = None
+# Watch mode renders from worker threads; WeasyPrint's shared font configuration is not thread-safe
+_renderer_lock = threading.Lock()
+
+
+def render_in_process(markdown_content: str, output_path: str, stylesheet: str = "executive", title: str = ""):
+    """Render in this process, reusing the renderer across calls. Renders are serialized."""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = WarmRenderer()
+        _renderer.render(markdown_content, output_path, stylesheet, title)
+
+
+def render_via_daemon(markdown_content: str, output_path: str, stylesheet: str = "executive",
+                      title: str = "", socket_path: str = None, timeout: float = 60.0) -> bool:
+    """Ask a running renderer daemon to write the PDF. Returns False if it could not."""
+    socket_path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not is_own_socket(socket_path):
+        return False
+
+    request = json.dumps({
+        "markdown": markdown_content,
+        "output_path": os.path.abspath(output_path),
+        "stylesheet": stylesheet,
+        "title": title,
+    })
+    before = _file_signature(output_path)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(request.encode("utf-8") + b"\n")
+            with sock.makefile("r", encoding="utf-8") as reply_file:
+                reply = json.loads(reply_file.readline() or "{}")
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Renderer daemon unavailable ({e}), rendering in-process")
+        return False
+
+    if not reply.get("ok"):
+        print(f"⚠️  Renderer daemon failed ({reply.get('error', 'no reply')}), rendering in-process")
+        return False
+    after = _file_signature(output_path)
+    if after is None or after == before:
+        print(f"⚠️  Renderer daemon did not write {output_path}, rendering in-process")
+        return False
+    return True
+
+
+def render_pdf(markdown_content: str, output_path: str, stylesheet: str = "executive", title: str = ""):
+    """Render via the warm daemon when it is running, otherwise in this process."""
+    if not render_via_daemon(markdown_content, output_path, stylesheet, title):
+        render_in_process(markdown_content, output_path, stylesheet, title)
+
+
+class _RenderHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON reply line out."""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            self.server.renderer.render(
+                request["markdown"],
+                request["output_path"],
+                request.get("stylesheet", "executive"),
+                request.get("title", "")
+            )
+            reply = {"ok": True}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+def _remove_stale_socket(socket_path: str):
+    """Unlink a socket left behind by a daemon that exited; refuse to take over a live one."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+            return
+    raise OSError(errno.EADDRINUSE, f"A renderer daemon is already listening on {socket_path}")
+
+
+class RendererServer(socketserver.UnixStreamServer):
+    """Serves render requests one at a time from a single warm renderer."""
+
+    def __init__(self, socket_path: str, renderer: WarmRenderer = None):
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)), mode=0o700, exist_ok=True)
+        if os.path.lexists(socket_path):
+            _remove_stale_socket(socket_path)
+        self.renderer = renderer or WarmRenderer()
+        super().__init__(socket_path, _RenderHandler)
+        os.chmod(socket_path, 0o600)
+
+    def warm_up(self):
+        """Render a throwaway document per stylesheet so fonts and layout code are loaded."""
+        for name in STYLESHEETS:
+            self.renderer.render("# Warm Up\n\n- ready", None, name)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a warm PDF renderer daemon")
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path")
+
+    args = parser.parse_args()
+
+    server = RendererServer(args.socket)
+    server.warm_up()
+    print(f"🔥 PDF renderer listening on {args.socket} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Renderer stopped")
+    finally:
+        server.server_close()
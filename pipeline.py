@@ -0,0 +1,49 @@
+"""
+Stage scheduler used by ResumeTailor.run_workflow to overlap independent stages
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+
+class StageScheduler:
+    """Runs named stages in the background and hands back their results by name.
+
+    Stages run on a small thread pool so independent work overlaps; with
+    ``concurrent=False`` every stage runs inline in ``submit`` instead, which gives the
+    plain sequential behaviour.
+    """
+
+    def __init__(self, max_workers: int = 2, concurrent: bool = True):
+        self.concurrent = concurrent
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage") if concurrent else None
+        self._futures: Dict[str, Future] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def submit(self, name: str, fn: Callable) -> Future:
+        """Start ``fn`` as the stage ``name``."""
+        if name in self._futures and not self._futures[name].done():
+            raise ValueError(f"Stage already pending: {name}")
+        if self.concurrent:
+            future = self._executor.submit(fn)
+        else:
+            future = Future()
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+        self._futures[name] = future
+        return future
+
+    def result(self, name: str):
+        """Block until a stage finishes and return its result, re-raising its exception."""
+        return self._futures[name].result()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Streaming JSONL sink for batch tailoring results
+"""
+
+import os
+import json
+import argparse
+from typing import Dict, Iterator, Set
+from pydantic import ValidationError
+from models import BatchRecord
+
+
+class JsonlResultWriter:
+    """Append one BatchRecord per line, flushed to disk as soon as it is written."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        _drop_partial_line(self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record: BatchRecord):
+        """Write a record and fsync so it survives an interrupted batch."""
+        self._file.write(record.model_dump_json() + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _drop_partial_line(path: str, chunk_size: int = 4096):
+    """Cut a truncated trailing record from an interrupted write back to the last newline.
+
+    Otherwise the next appended record would be glued onto it and lost as well.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            position = start
+        f.truncate(0)
+
+
+def read_results(path: str) -> Iterator[BatchRecord]:
+    """Yield records one at a time, skipping a truncated trailing line from an interrupted write."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield BatchRecord.model_validate_json(line)
+            except ValidationError:
+                print(f"⚠️  Skipping unreadable record in {path}")
+
+
+def completed_jobs(path: str) -> Set[str]:
+    """Job descriptions that already have a successful record, for resuming a batch."""
+    return {record.jd_path for record in read_results(path) if record.status == "ok"}
+
+
+def latest_results(path: str) -> Dict[str, BatchRecord]:
+    """The last record per job description; earlier attempts were replaced by a resumed run."""
+    return {record.jd_path: record for record in read_results(path)}
+
+
+def summarize_results(path: str) -> Dict:
+    """Aggregate counts, scores, tokens and time over the latest record of each job."""
+    summary = {"total": 0, "ok": 0, "stopped": 0, "error": 0,
+               "mean_score": None, "min_score": None, "max_score": None,
+               "tokens_used": 0, "elapsed_seconds": 0.0}
+    score_sum = scored = 0
+
+    for record in latest_results(path).values():
+        summary["total"] += 1
+        summary[record.status] = summary.get(record.status, 0) + 1
+        summary["tokens_used"] += record.tokens_used
+        summary["elapsed_seconds"] += record.elapsed_seconds
+        if record.best_score is not None and record.best_score >= 0:
+            score_sum += record.best_score
+            scored += 1
+            summary["min_score"] = min(record.best_score, summary["min_score"] if summary["min_score"] is not None else 100)
+            summary["max_score"] = max(record.best_score, summary["max_score"] if summary["max_score"] is not None else 0)
+
+    if scored:
+        summary["mean_score"] = round(score_sum / scored, 1)
+    summary["elapsed_seconds"] = round(summary["elapsed_seconds"], 3)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a batch results JSONL file")
+    parser.add_argument("results", help="Path to results .jsonl file")
+    parser.add_argument("--errors", action="store_true", help="List jobs that failed")
+
+    args = parser.parse_args()
+
+    print(json.dumps(summarize_results(args.results), indent=2))
+    if args.errors:
+        for record in latest_results(args.results).values():
+            if record.status == "error":
+                print(f"❌ {record.jd_path}: {record.error}")
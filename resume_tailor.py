@@ -1,17 +1,47 @@
 import os
 import argparse
 import json
-import markdown
-from typing import Optional
-from openai import OpenAI
+import time
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from openai import OpenAI, APITimeoutError, LengthFinishReasonError, ContentFilterFinishReasonError
+from pydantic import ValidationError
 from pypdf import PdfReader
-from weasyprint import HTML, CSS
-from models import JobAnalysis, ReflectionCritique
+from pdf_renderer import render_pdf
+from models import JobAnalysis, JobAnalysisBatch, ReflectionCritique, RefinementPolicy, WorkflowResult, BatchRecord
+from pipeline import StageScheduler
+from artifact_store import ArtifactStore
+from result_sink import JsonlResultWriter, completed_jobs, summarize_results
+
+# Rough size of one JobAnalysis in the response, used when packing batched analysis calls
+ANALYSIS_OUTPUT_TOKENS = 400
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for packing requests."""
+    return len(text) // 4 + 1
+
+def job_output_path(jd_path: str, output_dir: str = ".") -> str:
+    """PDF path for a job description in batch and watch modes: <output_dir>/<jd stem>.pdf."""
+    stem = os.path.splitext(os.path.basename(jd_path))[0]
+    return os.path.join(output_dir, f"{stem}.pdf")
 
 class ResumeTailor:
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o",
+                 policy: Optional[RefinementPolicy] = None,
+                 analysis_model: Optional[str] = "gpt-4o-mini",
+                 reflection_model: Optional[str] = "gpt-4o-mini",
+                 cascade: bool = True,
+                 pipelined: bool = True,
+                 artifact_store: Optional[ArtifactStore] = None):
         """
-        Initialize with API key and selected model.
+        Initialize with API key, selected models and the refinement policy used by run_workflow.
+
+        ``model`` writes the resume. Job analysis and reflection are structured tasks routed to
+        ``analysis_model`` and ``reflection_model`` (``None`` means use ``model``). With ``cascade``
+        enabled, a stage is retried on ``model`` when the faster model's output fails validation
+        or looks unreliable. ``pipelined`` lets run_workflow overlap independent stages.
+        An ``artifact_store`` keeps every final version and reuses PDFs of identical Markdown.
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -19,6 +49,29 @@ class ResumeTailor:
         
         self.client = OpenAI(api_key=self.api_key)
         self.model = model
+        self.analysis_model = analysis_model or model
+        self.reflection_model = reflection_model or model
+        self.cascade = cascade
+        self.pipelined = pipelined
+        self.artifact_store = artifact_store
+        self.policy = policy or RefinementPolicy()
+        self.tokens_used = 0
+        self.last_result: Optional[WorkflowResult] = None
+        self._deadline: Optional[float] = None  # time.monotonic() by which run_workflow must finish
+
+    def _api(self) -> OpenAI:
+        """Client for the next request. While a time budget runs, the request gets the remaining
+        time as its timeout and is not retried, so it cannot outlast the budget."""
+        if self._deadline is None:
+            return self.client
+        return self.client.with_options(max_retries=0, timeout=max(self._deadline - time.monotonic(), 1.0))
+
+    def _track_usage(self, response):
+        """Accumulate token usage reported by the API so budgets can be enforced."""
+        usage = getattr(response, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if isinstance(total, int):
+            self.tokens_used += total
 
     def read_pdf(self, file_path: str) -> str:
         """Extracts text from a PDF file for LLM processing."""
@@ -33,10 +86,10 @@ class ResumeTailor:
             print(f"❌ Error reading PDF: {e}")
             raise
 
-    def call_llm_structured(self, prompt: str, system_prompt: str, response_format):
+    def call_llm_structured(self, prompt: str, system_prompt: str, response_format, model: Optional[str] = None):
         """Helper to call LLM with Structured Outputs. Temperature is set to 0 for consistency."""
-        response = self.client.beta.chat.completions.parse(
-            model=self.model,
+        response = self._api().beta.chat.completions.parse(
+            model=model or self.model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": prompt}
@@ -44,13 +97,124 @@ class ResumeTailor:
             response_format=response_format,
             temperature=0.0  # Zero temperature for consistent Match Scores and analysis
         )
+        self._track_usage(response)
         return response.choices[0].message.parsed
 
+    @staticmethod
+    def _is_low_confidence(result) -> bool:
+        """Heuristics for structured output that parsed but should not be trusted."""
+        if result is None:  # Refusal or empty parse
+            return True
+        if isinstance(result, JobAnalysis):
+            return not result.responsibilities or not (result.skills or result.keywords)
+        if isinstance(result, ReflectionCritique):
+            if not 0 <= result.match_score <= 100:
+                return True
+            return result.needs_revision and not result.critique_points
+        return False
+
+    def call_llm_cascade(self, prompt: str, system_prompt: str, response_format, model: str,
+                         escalate_on_truncation: bool = True):
+        """Call a stage on its routed model, escalating to the writing model when needed.
+
+        With ``escalate_on_truncation=False`` a truncated response is raised instead, for
+        callers that can shrink the request rather than repeat it on a bigger model.
+        """
+        if not self.cascade or model == self.model:
+            return self.call_llm_structured(prompt, system_prompt, response_format, model=model)
+
+        try:
+            result = self.call_llm_structured(prompt, system_prompt, response_format, model=model)
+            if not self._is_low_confidence(result):
+                return result
+            reason = "low confidence"
+        except LengthFinishReasonError as e:
+            if not escalate_on_truncation:
+                raise
+            reason = f"{type(e).__name__}"
+        except (ValidationError, ContentFilterFinishReasonError) as e:
+            reason = f"{type(e).__name__}"
+
+        print(f"   ↗️  Escalating {response_format.__name__} from {model} to {self.model} ({reason})")
+        return self.call_llm_structured(prompt, system_prompt, response_format, model=self.model)
+
     def analyze_job_description(self, jd_text: str) -> JobAnalysis:
         """Step 1: Extract key requirements using Structured Outputs."""
         system_prompt = "You are an expert ATS specialist. Extract key requirements from job descriptions."
         prompt = f"Analyze this job description and extract the key details:\n\n{jd_text}"
-        return self.call_llm_structured(prompt, system_prompt, JobAnalysis)
+        return self.call_llm_cascade(prompt, system_prompt, JobAnalysis, self.analysis_model)
+
+    def analyze_job_descriptions(self, jds: Dict[str, str], max_batch_tokens: int = 16000,
+                                 max_batch_size: int = 10) -> Dict[str, JobAnalysis]:
+        """Analyze many job descriptions with as few structured-output calls as possible.
+
+        ``jds`` maps a source (e.g. file path) to its text. Descriptions are packed into
+        calls of at most ``max_batch_tokens`` estimated prompt + response tokens. A batch call
+        whose response is truncated or does not parse is split in half and retried; items
+        missing from a batch response or that look unreliable are retried individually.
+        Sources whose individual retry also fails to parse are left out of the result. Other
+        errors, e.g. authentication or connection failures, are raised.
+        """
+        results = {}
+        for batch in self._pack_analysis_batches(jds.items(), max_batch_tokens, max_batch_size):
+            results.update(self._analyze_batch(batch))
+        return results
+
+    @staticmethod
+    def _pack_analysis_batches(jds: Iterable[Tuple[str, str]], max_batch_tokens: int,
+                               max_batch_size: int) -> Iterator[List[Tuple[str, str]]]:
+        """Group (source, text) pairs into batches lazily, in order."""
+        current, current_tokens = [], 0
+        for source, text in jds:
+            tokens = estimate_tokens(text or "") + ANALYSIS_OUTPUT_TOKENS
+            if current and (current_tokens + tokens > max_batch_tokens or len(current) >= max_batch_size):
+                yield current
+                current, current_tokens = [], 0
+            current.append((source, text))
+            current_tokens += tokens
+        if current:
+            yield current
+
+    def _analyze_single(self, source: str, text: str) -> Dict[str, JobAnalysis]:
+        try:
+            return {source: self.analyze_job_description(text)}
+        except (ValidationError, LengthFinishReasonError, ContentFilterFinishReasonError) as e:
+            print(f"❌ Error analyzing {source}: {e}")
+            return {}
+
+    def _analyze_batch(self, batch: List[Tuple[str, str]]) -> Dict[str, JobAnalysis]:
+        if len(batch) == 1:
+            return self._analyze_single(*batch[0])
+
+        # Short ids keep the model from mangling file paths when echoing them back
+        ids = {f"JD{n}": source for n, (source, _) in enumerate(batch, 1)}
+        texts = dict(batch)
+        system_prompt = ("You are an expert ATS specialist. Extract key requirements from each job description "
+                         "independently. Return exactly one analysis per job, tagged with its id.")
+        jobs = "\n\n".join(f'<job id="{job_id}">\n{texts[source]}\n</job>' for job_id, source in ids.items())
+        prompt = f"Analyze each of these {len(batch)} job descriptions and extract the key details:\n\n{jobs}"
+
+        print(f"🔍 Analyzing {len(batch)} Job Descriptions in one call...")
+        try:
+            # Escalating a truncated batch to a bigger model would only truncate again; split it instead
+            response = self.call_llm_cascade(prompt, system_prompt, JobAnalysisBatch, self.analysis_model,
+                                             escalate_on_truncation=False)
+        except (ValidationError, LengthFinishReasonError) as e:
+            middle = len(batch) // 2
+            print(f"   ✂️  Batch of {len(batch)} failed ({type(e).__name__}), splitting")
+            return {**self._analyze_batch(batch[:middle]), **self._analyze_batch(batch[middle:])}
+
+        results = {}
+        for item in (response.analyses if response else []):
+            source = ids.get(item.source_id.strip())
+            if source and source not in results and not self._is_low_confidence(item.analysis):
+                results[source] = item.analysis
+
+        for source, text in batch:
+            if source not in results:
+                print(f"   ↩️  Retrying {source} individually")
+                results.update(self._analyze_single(source, text))
+        return results
 
     def reflect_on_resume(self, tailored_resume: str, jd_text: str) -> ReflectionCritique:
         """Step 3: Critique the generated resume for quality and accuracy."""
@@ -71,92 +235,21 @@ TAILORED RESUME:
 {tailored_resume}
 
 Evaluate this resume against the job description. Provide a match score (0-100) and specific critique points about what's missing or weak."""
-        return self.call_llm_structured(prompt, system_prompt, ReflectionCritique)
+        return self.call_llm_cascade(prompt, system_prompt, ReflectionCritique, self.reflection_model)
     
     def generate_pdf(self, markdown_content: str, output_path: str):
-        """Step 4: Convert Markdown to a polished executive PDF."""
+        """Step 4: Convert Markdown to a polished executive PDF.
+
+        Uses the warm renderer daemon (``python pdf_renderer.py``) when it is running, and
+        skips rendering entirely when the artifact store already has a PDF of this Markdown.
+        """
+        if self.artifact_store is not None and self.artifact_store.export_pdf(markdown_content, output_path):
+            print(f"♻️  Reused stored PDF for identical Markdown: {output_path}")
+            return
         print(f"📄 Generating PDF: {output_path}")
-        html_content = markdown.markdown(markdown_content, extensions=['extra', 'nl2br'])
-        
-        # Professional executive-style CSS for a clean, non-ugly layout
-        css = CSS(string="""
-            @page { 
-                size: letter; 
-                margin: 0.5in 0.65in; 
-                @bottom-right {
-                    content: counter(page);
-                    font-size: 9pt;
-                    color: #999;
-                }
-            }
-            body { 
-                font-family: 'Helvetica', 'Arial', sans-serif; 
-                font-size: 10pt; 
-                line-height: 1.4; 
-                color: #333; 
-            }
-            h1 { 
-                font-size: 24pt; 
-                color: #1a1a1a; 
-                margin-bottom: 2pt; 
-                text-align: center; 
-                text-transform: uppercase;
-                letter-spacing: 2px;
-                font-weight: 300;
-            }
-            /* Contact Line */
-            h1 + p { 
-                text-align: center; 
-                font-size: 8.5pt; 
-                color: #555; 
-                margin-bottom: 25pt; 
-                text-transform: uppercase;
-                letter-spacing: 1px;
-                border-bottom: 1px solid #eee;
-                padding-bottom: 10pt;
-            }
-            h2 { 
-                font-size: 12pt; 
-                color: #2c5aa0; 
-                border-bottom: 1.5pt solid #2c5aa0; 
-                text-transform: uppercase; 
-                margin-top: 20pt; 
-                margin-bottom: 10pt; 
-                font-weight: bold; 
-                letter-spacing: 1px;
-            }
-            h3 { 
-                font-size: 11pt; 
-                font-weight: bold; 
-                margin-top: 12pt; 
-                margin-bottom: 0; 
-                color: #1a1a1a;
-            }
-            /* Date and Location line */
-            h3 + p { 
-                font-style: italic; 
-                color: #4a5568; 
-                font-size: 9pt; 
-                margin-top: 0;
-                margin-bottom: 6pt; 
-            }
-            ul { 
-                margin-top: 0; 
-                margin-bottom: 8pt; 
-                padding-left: 15pt; 
-            }
-            li { 
-                margin-bottom: 3pt; 
-                text-align: justify;
-            }
-            strong { 
-                color: #2d3748; 
-                font-weight: 600; 
-            }
-        """)
-        
-        full_html = f"<!DOCTYPE html><html><body>{html_content}</body></html>"
-        HTML(string=full_html).write_pdf(output_path, stylesheets=[css])
+        render_pdf(markdown_content, output_path, stylesheet="executive")
+        if self.artifact_store is not None:
+            self.artifact_store.put_pdf(markdown_content, output_path)
 
     def tailor_resume(self, original: str, jd: str, analysis: JobAnalysis, critique_points: str = "") -> str:
         """Step 2: Synthesize the tailored resume text with proper hierarchy."""
@@ -193,97 +286,461 @@ Evaluate this resume against the job description. Provide a match score (0-100)
         Remember: Use ONLY content from the original resume. Do not add fictional experience.
         """
 
-        response = self.client.chat.completions.create(
+        response = self._api().chat.completions.create(
             model=self.model,
             messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
             temperature=0.7
         )
+        self._track_usage(response)
         return response.choices[0].message.content
 
-    def run_workflow(self, resume_path: str, jd_path: str, output_name: str = "tailored_resume.pdf"):
-        """Orchestrate the process and track the best version to prevent score regression."""
-        if resume_path.lower().endswith('.pdf'):
-            original = self.read_pdf(resume_path)
-        else:
-            with open(resume_path, 'r') as f: original = f.read()
+    def tailor_section(self, source_section: str, tailored_section: str, analysis: JobAnalysis) -> str:
+        """Rewrite one section of an existing tailored resume after its source content changed."""
+        system_prompt = """You are an expert technical resume writer updating one section of a tailored resume.
+        Keep the existing Markdown heading line and formatting conventions exactly.
 
-        with open(jd_path, 'r') as f: jd = f.read()
+        CRITICAL RULES:
+        - Use ONLY information from the UPDATED SOURCE SECTION provided
+        - DO NOT add, fabricate, or hallucinate any experience, skills, or achievements
+        - Return only the rewritten section, starting with its heading line"""
 
-        # Step 1: Analysis
-        print("🔍 Analyzing Job Description...")
-        analysis = self.analyze_job_description(jd)
+        prompt = f"""
+        UPDATED SOURCE SECTION:
+        {source_section}
+
+        CURRENT TAILORED SECTION:
+        {tailored_section}
+
+        TARGET JOB REQUIREMENTS:
+        {analysis.model_dump_json(indent=2)}
+
+        Rewrite the tailored section so it reflects the updated source content while staying
+        aligned with the target job requirements.
+        """
+
+        response = self._api().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
+            temperature=0.7
+        )
+        self._track_usage(response)
+        return response.choices[0].message.content.strip()
+
+    def _budget_exhausted(self, policy: RefinementPolicy, start_time: float, start_tokens: int,
+                          cycle_seconds: float = 0.0, cycle_tokens: int = 0) -> Optional[str]:
+        """Return a stop reason if another refine + reflect cycle would exceed the budgets.
+
+        The cost of the next cycle is projected from the cycle that just finished; without
+        one, this reports whether a budget is already used up.
+        """
+        elapsed = time.monotonic() - start_time
+        if policy.max_seconds is not None and elapsed + cycle_seconds > policy.max_seconds:
+            return "time_budget"
+        spent = self.tokens_used - start_tokens
+        if policy.max_tokens is not None and spent + cycle_tokens > policy.max_tokens:
+            return "token_budget"
+        return None
+
+    def _speculative_render(self, stages: StageScheduler, draft: str, output_name: str,
+                            temp_paths: List[str]) -> Tuple[str, str, str]:
+        """Render a draft to a temporary PDF next to the output, in the background.
+
+        Renders directly rather than through generate_pdf, so drafts that lose are never
+        added to the artifact store.
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=".pdf", prefix=".speculative-",
+                                         dir=os.path.dirname(os.path.abspath(output_name)))
+        os.close(fd)
+        temp_paths.append(temp_path)
+        stage = f"speculative_pdf_{len(temp_paths)}"
+        stages.submit(stage, lambda: render_pdf(draft, temp_path, stylesheet="executive"))
+        return draft, stage, temp_path
+
+    @staticmethod
+    def _discard_speculative(stages: StageScheduler, speculative: Tuple[str, str, str]):
+        _, stage, temp_path = speculative
+        try:
+            stages.result(stage)
+        except Exception:
+            pass
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    def run_workflow(self, resume_path: str, jd_path: str, output_name: str = "tailored_resume.pdf",
+                     policy: Optional[RefinementPolicy] = None, interactive: bool = True,
+                     analysis: Optional[JobAnalysis] = None):
+        """Orchestrate the process and track the best version to prevent score regression.
+
+        The reflection loop is governed by ``policy`` (defaults to ``self.policy``). A summary of
+        the run, including why refinement stopped, is stored on ``self.last_result``. With
+        ``interactive=False`` low scores are reported but never prompt for input. A previously
+        computed ``analysis`` of the same job description skips the analysis call.
+
+        When ``self.pipelined`` is set, independent stages overlap: the resume is read while
+        the job description is analyzed, and the best draft so far is rendered to PDF while a
+        refinement is in flight. The speculative PDF is used only if that draft is still the
+        best at the end, so the output matches the sequential path.
+        """
+        temp_paths = []
+        try:
+            with StageScheduler(max_workers=2, concurrent=self.pipelined) as stages:
+                return self._run_workflow(stages, temp_paths, resume_path, jd_path, output_name,
+                                          policy, interactive, analysis)
+        finally:
+            self._deadline = None
+            for temp_path in temp_paths:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    def _run_workflow(self, stages: StageScheduler, temp_paths: List[str], resume_path: str, jd_path: str,
+                      output_name: str, policy: Optional[RefinementPolicy], interactive: bool,
+                      analysis: Optional[JobAnalysis]):
+        policy = policy or self.policy
+        start_time = time.monotonic()
+        start_tokens = self.tokens_used
+        self.last_result = None
+        if policy.max_seconds is not None:
+            self._deadline = start_time + policy.max_seconds
+        timings = {}
+        speculative = None
+
+        def timed(stage: str, started: float):
+            timings[stage] = round(timings.get(stage, 0.0) + time.monotonic() - started, 3)
 
-        # Step 2: Initial Draft
-        print("✍️  Generating Initial Draft...")
-        current_resume = self.tailor_resume(original, jd, analysis)
-        
-        # Track the best version found so far
-        best_resume = current_resume
         best_score = -1
+        best_critique_points = []
+        scores = []
+        stop_reason = "max_iterations"
+
+        def record(reason: str):
+            self.last_result = WorkflowResult(
+                best_score=best_score,
+                scores=scores,
+                iterations=len(scores),
+                stop_reason=reason,
+                elapsed_seconds=round(time.monotonic() - start_time, 3),
+                tokens_used=self.tokens_used - start_tokens,
+                critique_points=best_critique_points,
+                timings=timings,
+                budget_exceeded=self._budget_exhausted(policy, start_time, start_tokens),
+            )
+
+        def read_resume():
+            started = time.monotonic()
+            if resume_path.lower().endswith('.pdf'):
+                text = self.read_pdf(resume_path)
+            else:
+                with open(resume_path, 'r') as f: text = f.read()
+            timed("read", started)
+            return text
 
-        # Step 3: Reflection & Refinement Loop
-        for i in range(2):
-            print(f"🧐 Reflection Attempt {i+1}...")
-            critique = self.reflect_on_resume(current_resume, jd)
-            print(f"   Match Score: {critique.match_score}/100")
-
-            # Update best version if current score is higher
-            if critique.match_score > best_score:
-                best_score = critique.match_score
-                best_resume = current_resume
-                print(f"   ⭐ New best version tracked!")
-
-            # Check if score is below 70% threshold
-            if critique.match_score < 70:
-                print(f"\n⚠️  WARNING: Match score ({critique.match_score}%) is below 70%")
-                print("\n📋 Areas that need improvement:")
-                for idx, point in enumerate(critique.critique_points, 1):
-                    print(f"   {idx}. {point}")
-
-                print("\n💡 Your original resume may be missing key experience or skills for this role.")
-                print("   Consider updating your master resume to include:")
-                print("   - More relevant technical skills or certifications")
-                print("   - Experience with required tools/platforms")
-                print("   - Quantifiable achievements in areas mentioned in the job description")
-
-                response = input("\n❓ Continue with current resume (c) or stop to update resume (s)? [c/s]: ").strip().lower()
-
-                if response == 's' or response == 'stop':
-                    print("\n🛑 Stopping to allow resume updates.")
-                    print(f"   Current best score: {best_score}/100")
-                    print(f"\n   After updating your resume, run the tool again with:")
-                    print(f"   python resume_tailor.py <updated_resume> {jd_path} -o {output_name}")
+        try:
+            with open(jd_path, 'r') as f: jd = f.read()
+            # Fail before spending an analysis call on a resume that cannot be read
+            if not os.path.isfile(resume_path) or not os.access(resume_path, os.R_OK):
+                raise FileNotFoundError(f"Resume not found or not readable: {resume_path}")
+
+            # Step 1: Analysis, overlapped with reading the resume
+            stages.submit("read", read_resume)
+            if analysis is None:
+                print("🔍 Analyzing Job Description...")
+
+                def analyze():
+                    started = time.monotonic()
+                    result = self.analyze_job_description(jd)
+                    timed("analysis", started)
+                    return result
+
+                stages.submit("analysis", analyze)
+                try:
+                    analysis = stages.result("analysis")
+                except APITimeoutError:
+                    if self._deadline is None:
+                        raise
+                    print("🛑 Time budget used up during analysis.")
+                    record("time_budget")
                     return None
-                else:
-                    print("\n▶️  Continuing with current resume...\n")
-
-            if critique.needs_revision and i < 1:
-                print(f"   🔄 Refining based on critique points...")
-                current_resume = self.tailor_resume(original, jd, analysis, ". ".join(critique.critique_points))
             else:
+                print("♻️  Reusing cached Job Analysis...")
+            original = stages.result("read")
+
+            budget_reason = self._budget_exhausted(policy, start_time, start_tokens)
+            if budget_reason:
+                print(f"🛑 {budget_reason.replace('_', ' ').capitalize()} used up before drafting.")
+                record(budget_reason)
+                return None
+
+            # Step 2: Initial Draft
+            print("✍️  Generating Initial Draft...")
+            cycle_start, cycle_tokens_start = time.monotonic(), self.tokens_used
+            try:
+                current_resume = self.tailor_resume(original, jd, analysis)
+            except APITimeoutError:
+                if self._deadline is None:
+                    raise
+                print("🛑 Time budget used up during the first draft.")
+                record("time_budget")
+                return None
+            timed("draft", cycle_start)
+        
+            # Track the best version found so far
+            best_resume = current_resume
+
+            budget_reason = self._budget_exhausted(policy, start_time, start_tokens)
+            if budget_reason:
+                print(f"   ⏱️  Skipping reflection: {budget_reason.replace('_', ' ')} used up by the first draft.")
+                stop_reason = budget_reason
+
+            # Step 3: Reflection & Refinement Loop
+            for i in range(0 if budget_reason else policy.max_iterations):
+                print(f"🧐 Reflection Attempt {i+1}...")
+                started = time.monotonic()
+                try:
+                    critique = self.reflect_on_resume(current_resume, jd)
+                except APITimeoutError:
+                    if self._deadline is None:
+                        raise
+                    print("   ⏱️  Stopping refinement: time budget used up during reflection.")
+                    stop_reason = "time_budget"
+                    break
+                timed("reflection", started)
+                print(f"   Match Score: {critique.match_score}/100")
+                scores.append(critique.match_score)
+                cycle_seconds = time.monotonic() - cycle_start
+                cycle_tokens = self.tokens_used - cycle_tokens_start
+                gain = critique.match_score - best_score
+
+                # Update best version if current score is higher
+                if critique.match_score > best_score:
+                    best_score = critique.match_score
+                    best_resume = current_resume
+                    best_critique_points = critique.critique_points
+                    print(f"   ⭐ New best version tracked!")
+
+                # Check if score is below the warning threshold
+                if critique.match_score < policy.warning_threshold:
+                    print(f"\n⚠️  WARNING: Match score ({critique.match_score}%) is below {policy.warning_threshold}%")
+                    print("\n📋 Areas that need improvement:")
+                    for idx, point in enumerate(critique.critique_points, 1):
+                        print(f"   {idx}. {point}")
+
+                    print("\n💡 Your original resume may be missing key experience or skills for this role.")
+                    print("   Consider updating your master resume to include:")
+                    print("   - More relevant technical skills or certifications")
+                    print("   - Experience with required tools/platforms")
+                    print("   - Quantifiable achievements in areas mentioned in the job description")
+
+                    if interactive:
+                        response = input("\n❓ Continue with current resume (c) or stop to update resume (s)? [c/s]: ").strip().lower()
+                    else:
+                        response = "c"
+
+                    if response == 's' or response == 'stop':
+                        print("\n🛑 Stopping to allow resume updates.")
+                        print(f"   Current best score: {best_score}/100")
+                        print(f"\n   After updating your resume, run the tool again with:")
+                        print(f"   python resume_tailor.py <updated_resume> {jd_path} -o {output_name}")
+                        if speculative:
+                            self._discard_speculative(stages, speculative)
+                        record("user_stopped")
+                        return None
+                    else:
+                        print("\n▶️  Continuing with current resume...\n")
+
+                if policy.target_score is not None and critique.match_score >= policy.target_score:
+                    print(f"   🎯 Target score ({policy.target_score}) reached!")
+                    stop_reason = "target_score"
+                    break
                 if not critique.needs_revision:
                     print("   ✅ Quality check passed!")
-                break
+                    stop_reason = "quality_passed"
+                    break
+                if i > 0 and gain < policy.min_improvement:
+                    print(f"   📉 Score plateaued (gain {gain} < {policy.min_improvement}), stopping refinement.")
+                    stop_reason = "plateau"
+                    break
+                if i == policy.max_iterations - 1:
+                    stop_reason = "max_iterations"
+                    break
+                budget_reason = self._budget_exhausted(policy, start_time, start_tokens, cycle_seconds, cycle_tokens)
+                if budget_reason:
+                    print(f"   ⏱️  Stopping refinement: {budget_reason.replace('_', ' ')} would be exceeded.")
+                    stop_reason = budget_reason
+                    break
+
+                print(f"   🔄 Refining based on critique points...")
+                if self.pipelined and (speculative is None or speculative[0] != best_resume):
+                    # Render the current best while the refinement is in flight
+                    if speculative:
+                        self._discard_speculative(stages, speculative)
+                    speculative = self._speculative_render(stages, best_resume, output_name, temp_paths)
+                cycle_start, cycle_tokens_start = time.monotonic(), self.tokens_used
+                try:
+                    current_resume = self.tailor_resume(original, jd, analysis, ". ".join(critique.critique_points))
+                except APITimeoutError:
+                    if self._deadline is None:
+                        raise
+                    print("   ⏱️  Stopping refinement: time budget used up during refinement.")
+                    stop_reason = "time_budget"
+                    break
+                timed("refinement", cycle_start)
+
+            # Final Step: Generate PDF from the version with the highest Match Score
+            print(f"🏆 Finalizing PDF with Best Score: {best_score}/100 (stop reason: {stop_reason})")
+            started = time.monotonic()
+            reused = False
+            if speculative and speculative[0] == best_resume:
+                try:
+                    stages.result(speculative[1])
+                    os.replace(speculative[2], output_name)
+                    reused = True
+                    print(f"   ⚡ Reused PDF rendered during refinement: {output_name}")
+                    if self.artifact_store is not None:
+                        self.artifact_store.put_pdf(best_resume, output_name)
+                except Exception as e:
+                    print(f"   ⚠️  Speculative PDF unusable ({e}), rendering again")
+            elif speculative:
+                self._discard_speculative(stages, speculative)
+            if not reused:
+                self.generate_pdf(best_resume, output_name)
+            timed("pdf", started)
+            if self.artifact_store is not None:
+                self.artifact_store.record_version(jd_path, jd, best_resume,
+                                                   best_score if best_score >= 0 else None, output_name)
+            record(stop_reason)
+            return best_resume
+        except Exception:
+            # Keep tokens and timings spent so far for the batch record
+            record("error")
+            raise
+
+    def run_job(self, resume_path: str, jd_path: str, output_path: str,
+                policy: Optional[RefinementPolicy] = None,
+                analysis: Optional[JobAnalysis] = None) -> BatchRecord:
+        """Run the workflow non-interactively and describe the outcome as a BatchRecord.
+
+        Errors are captured in the record rather than raised, so one bad job description
+        does not abort a batch.
+        """
+        started = time.monotonic()
+        try:
+            result = self.run_workflow(resume_path, jd_path, output_path, policy=policy,
+                                       interactive=False, analysis=analysis)
+            status, error = ("ok" if result is not None else "stopped"), None
+        except Exception as e:
+            print(f"❌ Error tailoring {jd_path}: {e}")
+            status, error = "error", str(e)
+
+        summary = self.last_result
+        return BatchRecord(
+            jd_path=jd_path,
+            output_path=output_path if status == "ok" else None,
+            status=status,
+            error=error,
+            best_score=summary.best_score if summary else None,
+            scores=summary.scores if summary else [],
+            critique_points=summary.critique_points if summary else [],
+            stop_reason=summary.stop_reason if summary else None,
+            timings=summary.timings if summary else {},
+            budget_exceeded=summary.budget_exceeded if summary else None,
+            elapsed_seconds=round(time.monotonic() - started, 3),
+            tokens_used=summary.tokens_used if summary else 0,
+            finished_at=datetime.now(timezone.utc).isoformat(),
+        )
 
-        # Final Step: Generate PDF from the version with the highest Match Score
-        print(f"🏆 Finalizing PDF with Best Score: {best_score}/100")
-        self.generate_pdf(best_resume, output_name)
-        return best_resume
+    def run_batch(self, resume_path: str, jd_paths: List[str], output_dir: str = ".",
+                  results_path: str = "results.jsonl", resume: bool = True,
+                  policy: Optional[RefinementPolicy] = None, max_batch_tokens: int = 16000,
+                  max_batch_size: int = 10) -> dict:
+        """Tailor the resume to many job descriptions, streaming one JSONL record per job.
+
+        Each record is flushed as soon as its job finishes, so memory stays flat and an
+        interrupted batch can be resumed: with ``resume=True`` jobs already recorded as
+        successful in ``results_path`` are skipped. Pending job descriptions are read and
+        analyzed one packed batch at a time, and that batch is tailored and written before
+        the next one is analyzed. Returns the summary of the results file.
+        """
+        done = completed_jobs(results_path) if resume else set()
+        os.makedirs(output_dir, exist_ok=True)
+
+        with JsonlResultWriter(results_path) as writer:
+            pending = self._pending_jobs(jd_paths, done, results_path)
+            for batch in self._pack_analysis_batches(pending, max_batch_tokens, max_batch_size):
+                readable = {jd_path: text for jd_path, text in batch if text is not None}
+                analyses = {}
+                if len(readable) > 1:
+                    try:
+                        analyses = self.analyze_job_descriptions(readable, max_batch_tokens, max_batch_size)
+                    except Exception as e:
+                        # Each job then analyzes on its own and records its own error
+                        print(f"❌ Batched analysis failed: {e}")
+
+                for jd_path, _ in batch:
+                    print(f"\n📌 Tailoring for {jd_path}")
+                    writer.write(self.run_job(resume_path, jd_path, job_output_path(jd_path, output_dir),
+                                              policy, analyses.get(jd_path)))
+
+        return summarize_results(results_path)
+
+    @staticmethod
+    def _pending_jobs(jd_paths: List[str], done: set, results_path: str) -> Iterator[Tuple[str, Optional[str]]]:
+        """(path, text) for each job still to run; text is None when it cannot be read,
+        leaving run_job to record the error."""
+        for jd_path in jd_paths:
+            if jd_path in done:
+                print(f"⏭️  Skipping {jd_path} (already in {results_path})")
+                continue
+            try:
+                with open(jd_path, 'r') as f: yield jd_path, f.read()
+            except OSError:
+                yield jd_path, None
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Tailor a resume with Executive PDF support")
     parser.add_argument("resume", help="Path to original resume (.pdf or .txt)")
-    parser.add_argument("job", help="Path to job description (.txt)")
+    parser.add_argument("job", nargs="+", help="Path(s) to job description (.txt)")
     parser.add_argument("-o", "--output", default="tailored_resume.pdf", help="Output PDF name")
+    parser.add_argument("--results", help="Stream per-job results to this JSONL file (batch mode)")
+    parser.add_argument("--output-dir", default=".", help="Directory for PDFs in batch mode")
+    parser.add_argument("-m", "--model", default="gpt-4o", help="Model used to write the resume")
+    parser.add_argument("--analysis-model", default="gpt-4o-mini", help="Model used for job analysis")
+    parser.add_argument("--reflection-model", default="gpt-4o-mini", help="Model used to score drafts")
+    parser.add_argument("--no-cascade", action="store_true", help="Never escalate analysis/reflection to --model")
+    parser.add_argument("--sequential", action="store_true", help="Run workflow stages one at a time")
+    parser.add_argument("--store", help="Keep versions in this artifact store directory and reuse its PDFs")
+    parser.add_argument("--max-iterations", type=int, default=2, help="Maximum reflection passes")
+    parser.add_argument("--target-score", type=int, default=90, help="Stop once a draft reaches this Match Score")
+    parser.add_argument("--min-improvement", type=int, default=3, help="Stop when a refinement gains fewer points than this")
+    parser.add_argument("--max-seconds", type=float, help="Wall-clock budget per resume")
+    parser.add_argument("--max-tokens", type=int, help="LLM token budget per resume")
     
     args = parser.parse_args()
 
     try:
-        tailor = ResumeTailor()
-        result = tailor.run_workflow(args.resume, args.job, args.output)
-        if result is not None:
-            print(f"\n✨ Successfully created: {args.output}")
+        policy = RefinementPolicy(
+            max_iterations=args.max_iterations,
+            target_score=args.target_score,
+            min_improvement=args.min_improvement,
+            max_seconds=args.max_seconds,
+            max_tokens=args.max_tokens,
+        )
+        tailor = ResumeTailor(
+            model=args.model,
+            policy=policy,
+            analysis_model=args.analysis_model,
+            reflection_model=args.reflection_model,
+            cascade=not args.no_cascade,
+            pipelined=not args.sequential,
+            artifact_store=ArtifactStore(args.store) if args.store else None,
+        )
+        if args.results or len(args.job) > 1:
+            summary = tailor.run_batch(args.resume, args.job, args.output_dir, args.results or "results.jsonl")
+            print(f"\n📊 Batch summary: {json.dumps(summary, indent=2)}")
         else:
-            print("\n👋 Exiting. Good luck with your resume updates!")
+            result = tailor.run_workflow(args.resume, args.job[0], args.output)
+            if result is not None:
+                print(f"\n✨ Successfully created: {args.output}")
+            else:
+                print("\n👋 Exiting. Good luck with your resume updates!")
     except Exception as e:
-        print(f"\n❌ Error: {e}")
\ No newline at end of file
+        print(f"\n❌ Error: {e}")
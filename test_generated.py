@@ -93,7 +93,10 @@ def test_reflection_critique_empty_fields():
 import pytest
 from unittest.mock import patch, MagicMock
 from resume_tailor import ResumeTailor
-from models import JobAnalysis, ReflectionCritique
+from models import JobAnalysis, JobAnalysisBatch, SourcedJobAnalysis, ReflectionCritique, RefinementPolicy
+import re
+from openai import APITimeoutError, LengthFinishReasonError
+import time
 
 @pytest.fixture
 def resume_tailor_instance():
@@ -149,12 +152,13 @@ def test_reflect_on_resume(resume_tailor_instance):
         result = resume_tailor_instance.reflect_on_resume(tailored_resume, jd_text)
         assert result == mock_reflection_critique
 
-def test_generate_pdf(resume_tailor_instance, tmp_path):
+def test_generate_pdf(resume_tailor_instance, tmp_path, monkeypatch):
     """Test generating a PDF from markdown content."""
     markdown_content = "# Test Resume"
     output_path = tmp_path / "output.pdf"
+    monkeypatch.setenv("RESUME_RENDERER_SOCKET", str(tmp_path / "no-daemon.sock"))
 
-    with patch('resume_tailor.HTML.write_pdf') as mock_write_pdf:
+    with patch('weasyprint.HTML.write_pdf') as mock_write_pdf:
         resume_tailor_instance.generate_pdf(markdown_content, str(output_path))
         mock_write_pdf.assert_called_once()
 
@@ -186,6 +190,751 @@ def test_run_workflow(resume_tailor_instance, tmp_path):
         assert result == "Tailored resume content."
         mock_generate_pdf.assert_called_once()
 
+def _critique(score, needs_revision=True):
+    return ReflectionCritique(match_score=score, critique_points=["Point"], hallucination_check=False, needs_revision=needs_revision)
+
+def _run_with_scores(instance, tmp_path, scores, policy, output_path=None,
+                     analyze=None, tailor=None, reflect=None):
+    """Run the workflow on sample files. ``analyze``, ``tailor`` and ``reflect`` override the
+    side effects of the patched stages; by default drafts are "Draft <n>" scored ``scores``."""
+    resume_path = tmp_path / "resume.txt"
+    resume_path.write_text("Original resume content.")
+    jd_path = tmp_path / "job_description.txt"
+    jd_path.write_text("Job description text.")
+    output_path = output_path or str(tmp_path / "tailored_resume.pdf")
+    empty_analysis = JobAnalysis(responsibilities=[], skills=[], keywords=[], experience_requirements="", success_metrics=[])
+
+    def fake_generate_pdf(markdown_content, path, stylesheet="executive"):
+        with open(path, "w") as f:
+            f.write(markdown_content)
+
+    with patch.object(instance, 'analyze_job_description', return_value=empty_analysis, side_effect=analyze), \
+         patch.object(instance, 'tailor_resume', side_effect=tailor or [f"Draft {i}" for i in range(len(scores))]) as mock_tailor, \
+         patch.object(instance, 'reflect_on_resume', side_effect=reflect or [_critique(s) for s in scores]), \
+         patch.object(instance, 'generate_pdf', side_effect=fake_generate_pdf) as mock_generate_pdf, \
+         patch('resume_tailor.render_pdf', side_effect=fake_generate_pdf), \
+         patch('builtins.input', return_value='c'):
+        result = instance.run_workflow(str(resume_path), str(jd_path), output_path, policy=policy)
+    return result, mock_tailor.call_count, mock_generate_pdf
+
+def test_run_workflow_stops_at_target_score(resume_tailor_instance, tmp_path):
+    """A first draft that meets the target score is not refined."""
+    result, drafts, _ = _run_with_scores(resume_tailor_instance, tmp_path, [95, 99], RefinementPolicy(max_iterations=3, target_score=90))
+    assert result == "Draft 0"
+    assert drafts == 1
+    assert resume_tailor_instance.last_result.stop_reason == "target_score"
+
+def test_run_workflow_stops_on_plateau(resume_tailor_instance, tmp_path):
+    """Refinement stops when the score gain falls below min_improvement."""
+    result, drafts, _ = _run_with_scores(resume_tailor_instance, tmp_path, [75, 76, 90], RefinementPolicy(max_iterations=5, min_improvement=3))
+    assert result == "Draft 1"
+    assert drafts == 2
+    assert resume_tailor_instance.last_result.stop_reason == "plateau"
+    assert resume_tailor_instance.last_result.scores == [75, 76]
+
+def _spend(instance, tokens, result):
+    """Stage side effect that uses ``tokens`` and returns ``result``."""
+    def spend(*args, **kwargs):
+        instance.tokens_used += tokens
+        return result
+    return spend
+
+def test_run_workflow_respects_token_budget(resume_tailor_instance, tmp_path):
+    """No refinement is started when the projected cycle cost exceeds the token budget."""
+    resume_tailor_instance.tokens_used = 0
+    _, drafts, _ = _run_with_scores(resume_tailor_instance, tmp_path, [80] * 4,
+                                    RefinementPolicy(max_iterations=4, max_tokens=1000),
+                                    tailor=_spend(resume_tailor_instance, 600, "Draft"))
+    assert drafts == 1
+    assert resume_tailor_instance.last_result.stop_reason == "token_budget"
+    assert resume_tailor_instance.last_result.tokens_used == 600
+
+def test_run_workflow_skips_reflection_when_draft_exhausts_budget(resume_tailor_instance, tmp_path):
+    """A budget used up by the first draft stops before reflecting and is reported."""
+    resume_tailor_instance.tokens_used = 0
+    result, _, mock_generate_pdf = _run_with_scores(resume_tailor_instance, tmp_path, [80],
+                                                    RefinementPolicy(max_tokens=1000),
+                                                    tailor=_spend(resume_tailor_instance, 1200, "Draft"))
+    assert result == "Draft"
+    mock_generate_pdf.assert_called_once()
+    assert resume_tailor_instance.last_result.scores == []
+    assert resume_tailor_instance.last_result.stop_reason == "token_budget"
+    assert resume_tailor_instance.last_result.budget_exceeded == "token_budget"
+
+def test_run_workflow_stops_before_draft_when_analysis_exhausts_budget(resume_tailor_instance, tmp_path):
+    """No draft is written once analysis alone has used up the budget."""
+    resume_tailor_instance.tokens_used = 0
+    result, drafts, _ = _run_with_scores(resume_tailor_instance, tmp_path, [80], RefinementPolicy(max_tokens=1000),
+                                         analyze=_spend(resume_tailor_instance, 1200, _analysis("Python")))
+    assert result is None
+    assert drafts == 0
+    assert resume_tailor_instance.last_result.stop_reason == "token_budget"
+
+def test_run_workflow_stops_when_reflection_times_out(resume_tailor_instance, tmp_path):
+    """A call cut off by the time budget ends refinement and keeps the draft."""
+    timeout = APITimeoutError.__new__(APITimeoutError)
+    result, _, mock_generate_pdf = _run_with_scores(resume_tailor_instance, tmp_path, [80],
+                                                    RefinementPolicy(max_seconds=60), reflect=timeout)
+    assert result == "Draft 0"
+    mock_generate_pdf.assert_called_once()
+    assert resume_tailor_instance.last_result.stop_reason == "time_budget"
+    assert resume_tailor_instance._deadline is None
+
+def test_run_workflow_stops_when_analysis_or_draft_times_out(resume_tailor_instance, tmp_path):
+    """A timeout before any draft exists ends the run as a time_budget stop, not an error."""
+    timeout = APITimeoutError.__new__(APITimeoutError)
+    for stage in ("analyze", "tailor"):
+        result, _, mock_generate_pdf = _run_with_scores(resume_tailor_instance, tmp_path, [80],
+                                                        RefinementPolicy(max_seconds=5), **{stage: timeout})
+        assert result is None
+        mock_generate_pdf.assert_not_called()
+        assert resume_tailor_instance.last_result.stop_reason == "time_budget"
+
+def test_requests_are_capped_by_time_budget(resume_tailor_instance):
+    """While a time budget runs, each API call gets the remaining time and no retries."""
+    client = resume_tailor_instance.client
+    resume_tailor_instance.call_llm_structured("prompt", "system", JobAnalysis)
+    client.with_options.assert_not_called()
+    client.beta.chat.completions.parse.assert_called_once()
+
+    resume_tailor_instance._deadline = time.monotonic() + 30
+    resume_tailor_instance.call_llm_structured("prompt", "system", JobAnalysis)
+    options = client.with_options.call_args.kwargs
+    assert options["max_retries"] == 0
+    assert 0 < options["timeout"] <= 30
+    client.with_options.return_value.beta.chat.completions.parse.assert_called_once()
+
+def test_run_workflow_checks_resume_before_analysis(resume_tailor_instance, tmp_path):
+    """A missing resume fails fast instead of costing an analysis call."""
+    jd_path = tmp_path / "job_description.txt"
+    jd_path.write_text("Job description text.")
+    with patch.object(resume_tailor_instance, 'analyze_job_description') as mock_analyze:
+        with pytest.raises(FileNotFoundError):
+            resume_tailor_instance.run_workflow(str(tmp_path / "missing.txt"), str(jd_path))
+    mock_analyze.assert_not_called()
+
+def test_stages_route_to_fast_model(resume_tailor_instance):
+    """Analysis and reflection use their own models; confident output is not escalated."""
+    analysis = JobAnalysis(responsibilities=["Lead QA"], skills=["Python"], keywords=["QA"], experience_requirements="5 years", success_metrics=[])
+
+    with patch.object(resume_tailor_instance, 'call_llm_structured', return_value=analysis) as mock_call:
+        result = resume_tailor_instance.analyze_job_description("Job description text.")
+    assert result == analysis
+    mock_call.assert_called_once()
+    assert mock_call.call_args.kwargs["model"] == "gpt-4o-mini"
+
+def test_cascade_escalates_low_confidence(resume_tailor_instance):
+    """A critique asking for revision without critique points is re-run on the writing model."""
+    weak = ReflectionCritique(match_score=60, critique_points=[], hallucination_check=False, needs_revision=True)
+    strong = ReflectionCritique(match_score=62, critique_points=["Add metrics"], hallucination_check=False, needs_revision=True)
+
+    with patch.object(resume_tailor_instance, 'call_llm_structured', side_effect=[weak, strong]) as mock_call:
+        result = resume_tailor_instance.reflect_on_resume("Tailored resume text.", "Job description text.")
+    assert result == strong
+    assert [c.kwargs["model"] for c in mock_call.call_args_list] == ["gpt-4o-mini", "gpt-4o"]
+
+def test_cascade_escalates_validation_error(resume_tailor_instance):
+    """Structured output that fails validation on the fast model is retried on the writing model."""
+    try:
+        JobAnalysis(responsibilities=[], skills=[], keywords=[], experience_requirements=123, success_metrics=[])
+    except ValidationError as e:
+        error = e
+    analysis = JobAnalysis(responsibilities=["Lead QA"], skills=["Python"], keywords=[], experience_requirements="", success_metrics=[])
+
+    with patch.object(resume_tailor_instance, 'call_llm_structured', side_effect=[error, analysis]) as mock_call:
+        result = resume_tailor_instance.analyze_job_description("Job description text.")
+    assert result == analysis
+    assert mock_call.call_count == 2
+
+def test_cascade_disabled(resume_tailor_instance):
+    """Without the cascade, low-confidence output is returned as-is."""
+    resume_tailor_instance.cascade = False
+    empty = JobAnalysis(responsibilities=[], skills=[], keywords=[], experience_requirements="", success_metrics=[])
+
+    with patch.object(resume_tailor_instance, 'call_llm_structured', return_value=empty) as mock_call:
+        assert resume_tailor_instance.analyze_job_description("Job description text.") == empty
+    mock_call.assert_called_once()
+
+
+def test_run_batch_streams_and_resumes(resume_tailor_instance, tmp_path):
+    """Each job is appended as it finishes; a rerun skips jobs already recorded as ok."""
+    resume_path = tmp_path / "resume.txt"
+    resume_path.write_text("Original resume content.")
+    jd_paths = []
+    for name in ["job_a.txt", "job_b.txt"]:
+        (tmp_path / name).write_text("Job description text.")
+        jd_paths.append(str(tmp_path / name))
+    results_path = tmp_path / "results.jsonl"
+
+    with patch.object(resume_tailor_instance, 'analyze_job_descriptions', return_value={}), \
+         patch.object(resume_tailor_instance, 'analyze_job_description', side_effect=[JobAnalysis(responsibilities=[], skills=[], keywords=[], experience_requirements="", success_metrics=[]), Exception("API down")]), \
+         patch.object(resume_tailor_instance, 'tailor_resume', return_value="Tailored resume content."), \
+         patch.object(resume_tailor_instance, 'reflect_on_resume', return_value=_critique(92)), \
+         patch.object(resume_tailor_instance, 'generate_pdf'):
+        summary = resume_tailor_instance.run_batch(str(resume_path), jd_paths, str(tmp_path / "out"), str(results_path))
+
+    records = list(read_results(str(results_path)))
+    assert [r.status for r in records] == ["ok", "error"]
+    assert records[0].best_score == 92
+    assert records[0].output_path.endswith("job_a.pdf")
+    assert "analysis" in records[0].timings
+    assert records[1].error == "API down"
+    assert summary["ok"] == 1 and summary["error"] == 1
+
+    with patch.object(resume_tailor_instance, 'run_workflow', return_value="Tailored resume content.") as mock_run:
+        resume_tailor_instance.run_batch(str(resume_path), jd_paths, str(tmp_path / "out"), str(results_path))
+    assert [c.args[1] for c in mock_run.call_args_list] == [jd_paths[1]]
+
+def test_run_job_keeps_partial_usage_on_error(resume_tailor_instance, tmp_path):
+    """A job that fails mid-run still records the tokens and time it spent."""
+    resume_tailor_instance.tokens_used = 0
+    resume_path = tmp_path / "resume.txt"
+    resume_path.write_text("Original resume content.")
+    jd_path = tmp_path / "job_description.txt"
+    jd_path.write_text("Job description text.")
+    with patch.object(resume_tailor_instance, 'analyze_job_description', return_value=_analysis("Python")), \
+         patch.object(resume_tailor_instance, 'tailor_resume', side_effect=_spend(resume_tailor_instance, 500, "Draft")), \
+         patch.object(resume_tailor_instance, 'reflect_on_resume', side_effect=RuntimeError("API down")):
+        record = resume_tailor_instance.run_job(str(resume_path), str(jd_path), str(tmp_path / "out.pdf"))
+    assert record.status == "error"
+    assert record.tokens_used == 500
+    assert record.stop_reason == "error"
+    assert "draft" in record.timings
+
+def _analysis(skill):
+    return JobAnalysis(responsibilities=["Lead"], skills=[skill], keywords=[], experience_requirements="", success_metrics=[])
+
+def test_analyze_job_descriptions_batches_and_maps_sources(resume_tailor_instance):
+    """Several short JDs share one call and results map back to their sources."""
+    batch = JobAnalysisBatch(analyses=[
+        SourcedJobAnalysis(source_id="JD2", analysis=_analysis("Go")),
+        SourcedJobAnalysis(source_id="JD1", analysis=_analysis("Python")),
+    ])
+
+    with patch.object(resume_tailor_instance, 'call_llm_cascade', return_value=batch) as mock_call:
+        results = resume_tailor_instance.analyze_job_descriptions({"a.txt": "Python role", "b.txt": "Go role"})
+    mock_call.assert_called_once()
+    assert results["a.txt"].skills == ["Python"]
+    assert results["b.txt"].skills == ["Go"]
+
+def test_analyze_job_descriptions_retries_missing_items(resume_tailor_instance):
+    """Items missing from the batch response or failing the confidence check are retried alone."""
+    batch = JobAnalysisBatch(analyses=[
+        SourcedJobAnalysis(source_id="JD1", analysis=_analysis("Python")),
+        SourcedJobAnalysis(source_id="JD2", analysis=JobAnalysis(responsibilities=[], skills=[], keywords=[], experience_requirements="", success_metrics=[])),
+    ])
+
+    with patch.object(resume_tailor_instance, 'call_llm_cascade', return_value=batch), \
+         patch.object(resume_tailor_instance, 'analyze_job_description', side_effect=[_analysis("Go"), _analysis("Rust")]) as mock_single:
+        results = resume_tailor_instance.analyze_job_descriptions({"a.txt": "A", "b.txt": "B", "c.txt": "C"})
+    assert mock_single.call_count == 2
+    assert {k: v.skills[0] for k, v in results.items()} == {"a.txt": "Python", "b.txt": "Go", "c.txt": "Rust"}
+
+def test_analyze_job_descriptions_splits_by_budget_and_on_failure(resume_tailor_instance):
+    """Batches respect the token budget, and a failed batch is split in half."""
+    jds = {f"{n}.txt": "x" * 400 for n in range(4)}  # ~500 tokens each including response
+
+    def fake_batch(prompt, system_prompt, response_format, model, **kwargs):
+        ids = re.findall(r'<job id="(JD\d+)">', prompt)
+        if len(ids) > 1:
+            raise ValidationError.from_exception_data("JobAnalysisBatch", [])
+        return JobAnalysisBatch(analyses=[SourcedJobAnalysis(source_id=ids[0], analysis=_analysis("Python"))])
+
+    with patch.object(resume_tailor_instance, 'call_llm_cascade', side_effect=fake_batch) as mock_call, \
+         patch.object(resume_tailor_instance, 'analyze_job_description', return_value=_analysis("Python")) as mock_single:
+        results = resume_tailor_instance.analyze_job_descriptions(jds, max_batch_tokens=1100)
+    assert sorted(results) == sorted(jds)
+    assert mock_call.call_count == 2  # Two batches of two, each of which failed
+    assert mock_single.call_count == 4
+
+def test_analyze_job_descriptions_propagates_other_errors(resume_tailor_instance):
+    """Only truncated or unparseable batches are split; other failures are raised."""
+    with patch.object(resume_tailor_instance, 'call_llm_cascade', side_effect=RuntimeError("auth failed")) as mock_call, \
+         patch.object(resume_tailor_instance, 'analyze_job_description') as mock_single:
+        with pytest.raises(RuntimeError):
+            resume_tailor_instance.analyze_job_descriptions({"a.txt": "A", "b.txt": "B"})
+    mock_call.assert_called_once()
+    mock_single.assert_not_called()
+
+def test_truncated_batch_is_split_without_escalating(resume_tailor_instance):
+    """A truncated batch response is not repeated on the writing model."""
+    truncated = LengthFinishReasonError.__new__(LengthFinishReasonError)
+    with patch.object(resume_tailor_instance, 'call_llm_structured', side_effect=truncated) as mock_call, \
+         patch.object(resume_tailor_instance, 'analyze_job_description', return_value=_analysis("Python")):
+        results = resume_tailor_instance.analyze_job_descriptions({"a.txt": "A", "b.txt": "B"})
+    assert sorted(results) == ["a.txt", "b.txt"]
+    assert [c.kwargs["model"] for c in mock_call.call_args_list] == [resume_tailor_instance.analysis_model]
+
+def test_run_batch_writes_each_batch_before_analyzing_the_next(resume_tailor_instance, tmp_path):
+    """Jobs of one analysis batch are tailored and recorded before the next batch is analyzed."""
+    jd_paths = []
+    for n in range(4):
+        (tmp_path / f"job_{n}.txt").write_text("x" * 400)
+        jd_paths.append(str(tmp_path / f"job_{n}.txt"))
+    results_path = tmp_path / "results.jsonl"
+    events = []
+
+    def fake_analyze(jds, *args):
+        events.append(("analyze", len(list(read_results(str(results_path))))))
+        return {source: _analysis("Python") for source in jds}
+
+    def fake_run_job(resume_path, jd_path, output_path, policy, analysis):
+        assert analysis is not None
+        return BatchRecord(jd_path=jd_path, output_path=output_path, status="ok", elapsed_seconds=0.0,
+                           finished_at="2026-01-01T00:00:00+00:00")
+
+    with patch.object(resume_tailor_instance, 'analyze_job_descriptions', side_effect=fake_analyze), \
+         patch.object(resume_tailor_instance, 'run_job', side_effect=fake_run_job):
+        resume_tailor_instance.run_batch("resume.txt", jd_paths, str(tmp_path / "out"), str(results_path),
+                                         max_batch_tokens=1100)
+    assert events == [("analyze", 0), ("analyze", 2)]
+
+# Tests for result_sink.py
+from result_sink import JsonlResultWriter, read_results, completed_jobs, summarize_results
+from models import BatchRecord
+
+def test_read_results_skips_truncated_line(tmp_path):
+    """A partially written final line from an interrupted batch is ignored."""
+    path = tmp_path / "results.jsonl"
+    with JsonlResultWriter(str(path)) as writer:
+        writer.write(BatchRecord(jd_path="a.txt", status="ok", best_score=80, elapsed_seconds=1.5, tokens_used=100, finished_at="2026-01-01T00:00:00+00:00"))
+        writer.write(BatchRecord(jd_path="b.txt", status="ok", best_score=90, elapsed_seconds=2.5, tokens_used=300, finished_at="2026-01-01T00:00:01+00:00"))
+    with open(path, "a") as f:
+        f.write('{"jd_path": "c.txt", "sta')
+
+    assert completed_jobs(str(path)) == {"a.txt", "b.txt"}
+    summary = summarize_results(str(path))
+    assert summary["total"] == 2
+    assert summary["mean_score"] == 85.0
+    assert summary["min_score"] == 80 and summary["max_score"] == 90
+    assert summary["tokens_used"] == 400
+
+def test_writer_appends_after_truncated_line(tmp_path):
+    """Resuming after an interrupted write drops the partial line instead of corrupting the next record."""
+    path = tmp_path / "results.jsonl"
+    with JsonlResultWriter(str(path)) as writer:
+        writer.write(BatchRecord(jd_path="a.txt", status="ok", elapsed_seconds=1.0, finished_at="2026-01-01T00:00:00+00:00"))
+        writer.write(BatchRecord(jd_path="b.txt", status="ok", elapsed_seconds=1.0, finished_at="2026-01-01T00:00:01+00:00"))
+    with open(path, "a") as f:
+        f.write('{"jd_path": "x.txt", "sta')
+
+    with JsonlResultWriter(str(path)) as writer:
+        writer.write(BatchRecord(jd_path="c.txt", status="ok", elapsed_seconds=1.0, finished_at="2026-01-01T00:00:02+00:00"))
+    assert completed_jobs(str(path)) == {"a.txt", "b.txt", "c.txt"}
+
+def test_summarize_results_uses_latest_attempt(tmp_path):
+    """A job that errored and then succeeded on resume counts once, as ok."""
+    path = tmp_path / "results.jsonl"
+    with JsonlResultWriter(str(path)) as writer:
+        writer.write(BatchRecord(jd_path="a.txt", status="ok", best_score=80, elapsed_seconds=1.0, finished_at="2026-01-01T00:00:00+00:00"))
+        writer.write(BatchRecord(jd_path="b.txt", status="error", error="API down", elapsed_seconds=1.0, finished_at="2026-01-01T00:00:01+00:00"))
+        writer.write(BatchRecord(jd_path="b.txt", status="ok", best_score=90, elapsed_seconds=2.0, finished_at="2026-01-01T00:00:02+00:00"))
+
+    summary = summarize_results(str(path))
+    assert (summary["total"], summary["ok"], summary["error"]) == (2, 2, 0)
+    assert summary["mean_score"] == 85.0
+
+def test_read_results_missing_file(tmp_path):
+    """A results file that does not exist yet has no records."""
+    assert list(read_results(str(tmp_path / "missing.jsonl"))) == []
+
+
+def test_run_workflow_reuses_speculative_pdf(resume_tailor_instance, tmp_path):
+    """When the refinement does not beat the best draft, the PDF rendered during it is kept."""
+    output_path = tmp_path / "out.pdf"
+    result, drafts, mock_generate_pdf = _run_with_scores(resume_tailor_instance, tmp_path, [80, 78], RefinementPolicy(max_iterations=2), str(output_path))
+
+    assert result == "Draft 0"
+    assert drafts == 2
+    mock_generate_pdf.assert_not_called()
+    assert output_path.read_text() == "Draft 0"
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".speculative-")] == []
+
+def test_speculative_pdfs_are_stored_only_when_used(resume_tailor_instance, tmp_path):
+    """Only the speculative PDF moved into place reaches the artifact store."""
+    resume_tailor_instance.artifact_store = MagicMock()
+    output_path = tmp_path / "out.pdf"
+    _run_with_scores(resume_tailor_instance, tmp_path, [80, 78], RefinementPolicy(max_iterations=2), str(output_path))
+
+    resume_tailor_instance.artifact_store.put_pdf.assert_called_once_with("Draft 0", str(output_path))
+
+def test_run_workflow_pipelined_matches_sequential(resume_tailor_instance, tmp_path):
+    """Overlapping stages does not change the chosen draft or the rendered PDF."""
+    outcomes = []
+    for pipelined in (False, True):
+        resume_tailor_instance.pipelined = pipelined
+        output_path = tmp_path / f"out_{pipelined}.pdf"
+        result, _, _ = _run_with_scores(resume_tailor_instance, tmp_path, [70, 85, 80], RefinementPolicy(max_iterations=3, min_improvement=0), str(output_path))
+        outcomes.append((result, output_path.read_text(), resume_tailor_instance.last_result.scores))
+    assert outcomes[0] == outcomes[1] == ("Draft 1", "Draft 1", [70, 85, 80])
+
+# Tests for pipeline.py
+import threading
+from pipeline import StageScheduler
+
+def test_stage_scheduler_overlaps_stages():
+    """Stages run in the background and their results are fetched by name."""
+    release = threading.Event()
+    with StageScheduler(max_workers=2) as stages:
+        stages.submit("slow", lambda: release.wait(5) and "read")
+        stages.submit("fast", lambda: 3)
+        assert stages.result("fast") == 3
+        release.set()
+        assert stages.result("slow") == "read"
+
+def test_stage_scheduler_reraises_stage_errors():
+    """A failed stage raises its exception from result(), run inline or in the background."""
+    for concurrent in (True, False):
+        with StageScheduler(concurrent=concurrent) as stages:
+            stages.submit("read", MagicMock(side_effect=OSError("missing")))
+            with pytest.raises(OSError, match="missing"):
+                stages.result("read")
+
+
+# Tests for pdf_renderer.py
+import threading
+import os
+import socket
+import tempfile
+from pdf_renderer import RendererServer, default_socket_path, render_pdf, render_via_daemon, markdown_to_html
+
+@pytest.fixture
+def renderer_daemon(tmp_path):
+    renderer = MagicMock()
+    renderer.render.side_effect = lambda markdown_content, output_path, *args: open(output_path, "wb").close()
+    socket_path = str(tmp_path / "renderer.sock")
+    server = RendererServer(socket_path, renderer=renderer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path, renderer
+    server.shutdown()
+    server.server_close()
+
+def test_render_pdf_uses_daemon(renderer_daemon, tmp_path, monkeypatch):
+    """A running daemon renders the document and the in-process path is skipped."""
+    socket_path, renderer = renderer_daemon
+    monkeypatch.setenv("RESUME_RENDERER_SOCKET", socket_path)
+
+    with patch('pdf_renderer.render_in_process') as mock_in_process:
+        render_pdf("# Test Resume", str(tmp_path / "out.pdf"), stylesheet="classic")
+    mock_in_process.assert_not_called()
+    renderer.render.assert_called_once_with("# Test Resume", str(tmp_path / "out.pdf"), "classic", "")
+
+def test_render_pdf_falls_back_when_daemon_fails(renderer_daemon, tmp_path, monkeypatch):
+    """A daemon-side error is reported and the PDF is rendered in-process instead."""
+    socket_path, renderer = renderer_daemon
+    renderer.render.side_effect = ValueError("Unknown stylesheet: fancy")
+    monkeypatch.setenv("RESUME_RENDERER_SOCKET", socket_path)
+
+    with patch('pdf_renderer.render_in_process') as mock_in_process:
+        render_pdf("# Test Resume", str(tmp_path / "out.pdf"), stylesheet="fancy")
+    mock_in_process.assert_called_once()
+
+def test_render_in_process_is_thread_safe(tmp_path, monkeypatch):
+    """Concurrent in-process renders share one renderer and never overlap."""
+    import time
+    import pdf_renderer
+    active, overlaps = [0], []
+
+    class SlowRenderer:
+        instances = 0
+
+        def __init__(self):
+            SlowRenderer.instances += 1
+            time.sleep(0.05)
+
+        def render(self, markdown_content, output_path, stylesheet, title):
+            active[0] += 1
+            overlaps.append(active[0] > 1)
+            time.sleep(0.05)
+            active[0] -= 1
+
+    monkeypatch.setattr(pdf_renderer, "_renderer", None)
+    monkeypatch.setattr(pdf_renderer, "WarmRenderer", SlowRenderer)
+    threads = [threading.Thread(target=pdf_renderer.render_in_process, args=("# Test", str(tmp_path / f"{n}.pdf")))
+               for n in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert SlowRenderer.instances == 1
+    assert overlaps == [False, False]
+
+def test_render_pdf_falls_back_when_daemon_writes_nothing(renderer_daemon, tmp_path, monkeypatch):
+    """An ok reply without a PDF on disk is not trusted."""
+    socket_path, renderer = renderer_daemon
+    renderer.render.side_effect = None
+    monkeypatch.setenv("RESUME_RENDERER_SOCKET", socket_path)
+
+    with patch('pdf_renderer.render_in_process') as mock_in_process:
+        render_pdf("# Test Resume", str(tmp_path / "out.pdf"))
+    mock_in_process.assert_called_once()
+
+def test_render_via_daemon_ignores_untrusted_socket_path(tmp_path):
+    """Nothing is sent unless the path is a socket owned by the current user."""
+    planted = tmp_path / "renderer.sock"
+    planted.write_text("")
+    with patch('socket.socket') as mock_socket:
+        assert render_via_daemon("# Test", str(tmp_path / "out.pdf"), socket_path=str(planted)) is False
+    mock_socket.assert_not_called()
+
+def test_renderer_server_replaces_only_stale_sockets(renderer_daemon, tmp_path):
+    """A second daemon refuses a live socket but reclaims one left by a dead daemon."""
+    socket_path, _ = renderer_daemon
+    with pytest.raises(OSError):
+        RendererServer(socket_path, renderer=MagicMock())
+
+    stale_path = str(tmp_path / "stale.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(stale_path)
+    stale.close()
+    server = RendererServer(stale_path, renderer=MagicMock())
+    server.server_close()
+
+def test_default_socket_path_is_private(monkeypatch):
+    """The default socket lives in the per-user runtime directory, not the shared temp directory."""
+    monkeypatch.delenv("RESUME_RENDERER_SOCKET", raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert default_socket_path() == "/run/user/1000/resume_renderer.sock"
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert os.path.dirname(default_socket_path()) != tempfile.gettempdir()
+
+def test_render_via_daemon_without_socket(tmp_path):
+    """No socket file means no daemon."""
+    assert render_via_daemon("# Test", str(tmp_path / "out.pdf"), socket_path=str(tmp_path / "missing.sock")) is False
+
+def test_markdown_to_html_title():
+    """The document title is only emitted when given."""
+    assert "<title>Resume</title>" in markdown_to_html("# Name", title="Resume")
+    assert "<title>" not in markdown_to_html("# Name")
+
+# Tests for incremental.py
+from incremental import IncrementalTailor, split_sections, section_hashes, diff_sections, replace_section
+
+SAMPLE_RESUME = """Jane Doe
+Contact: jane@example.com
+Professional Experience
+Acme – Austin, TX
+Engineer | January 2020 - Present
+Built things
+Globex – Dallas, TX
+Developer | March 2015 - December 2019
+Fixed things
+Education
+State University BS Computer Science"""
+
+SAMPLE_TAILORED = """# Jane Doe
+
+## Professional Experience
+
+### Acme – Austin, TX
+- Built things
+
+### Globex – Dallas, TX
+- Fixed things"""
+
+def test_split_sections_plain_text():
+    """Plain-text resumes split into header, section headings and roles."""
+    names = [name for name, _ in split_sections(SAMPLE_RESUME)]
+    assert names == ["header", "Professional Experience", "Acme – Austin, TX", "Globex – Dallas, TX", "Education"]
+
+def test_diff_sections():
+    """Only the edited role is reported as changed."""
+    updated = SAMPLE_RESUME.replace("Fixed things", "Fixed many things")
+    diff = diff_sections(section_hashes(SAMPLE_RESUME), section_hashes(updated))
+    assert diff == {"added": [], "removed": [], "changed": ["Globex – Dallas, TX"]}
+
+def test_replace_section():
+    """A role is swapped in the tailored Markdown, leaving the rest untouched."""
+    result = replace_section(SAMPLE_TAILORED, "Globex – Dallas, TX", "```markdown\n### Globex – Dallas, TX\n- Fixed many things\n```")
+    assert result.endswith("### Globex – Dallas, TX\n- Fixed many things")
+    assert "### Acme – Austin, TX\n- Built things" in result
+
+@pytest.fixture
+def incremental_setup(tmp_path):
+    resume_path = tmp_path / "resume.txt"
+    resume_path.write_text(SAMPLE_RESUME)
+    jd_path = tmp_path / "job.txt"
+    jd_path.write_text("Job description text.")
+    tailor = MagicMock()
+    tailor.analyze_job_description.return_value = JobAnalysis(responsibilities=["Build"], skills=["Python"], keywords=[], experience_requirements="", success_metrics=[])
+    tailor.run_workflow.return_value = SAMPLE_TAILORED
+    tailor.last_result.best_score = 88
+    incremental = IncrementalTailor(tailor, str(tmp_path / "manifest.json"))
+    output_path = str(tmp_path / "out.pdf")
+    incremental.tailor_output(str(resume_path), str(jd_path), output_path)
+    return incremental, tailor, resume_path, output_path
+
+def test_refresh_skips_unchanged(incremental_setup):
+    """Nothing is regenerated when the resume did not change, and the analysis is cached."""
+    incremental, tailor, resume_path, output_path = incremental_setup
+    report = incremental.refresh(str(resume_path))
+    assert report["unchanged"] == [output_path]
+    tailor.analyze_job_description.assert_called_once()
+    tailor.run_workflow.assert_called_once()
+
+def test_refresh_patches_changed_role(incremental_setup):
+    """An edited role is rewritten in place without a full re-run."""
+    incremental, tailor, resume_path, output_path = incremental_setup
+    resume_path.write_text(SAMPLE_RESUME.replace("Fixed things", "Fixed many things"))
+    tailor.tailor_section.return_value = "### Globex – Dallas, TX\n- Fixed many things"
+    tailor.reflect_on_resume.return_value = _critique(91)
+
+    report = incremental.refresh(str(resume_path))
+    assert report["patched"] == [output_path]
+    tailor.run_workflow.assert_called_once()
+    patched = tailor.generate_pdf.call_args.args[0]
+    assert "Fixed many things" in patched
+    assert incremental.manifest.outputs()[output_path]["best_score"] == 91
+    tailor.artifact_store.record_version.assert_called_once_with(
+        str(resume_path.parent / "job.txt"), "Job description text.", patched, 91, output_path)
+    assert incremental.refresh(str(resume_path))["unchanged"] == [output_path]
+
+def test_refresh_regenerates_on_new_role(incremental_setup):
+    """A structural change re-runs the workflow with the cached analysis."""
+    incremental, tailor, resume_path, output_path = incremental_setup
+    resume_path.write_text(SAMPLE_RESUME.replace("Education", "Initech – Houston, TX\nIntern | June 2014 - August 2014\nLearned things\nEducation"))
+
+    report = incremental.refresh(str(resume_path))
+    assert report["regenerated"] == [output_path]
+    assert tailor.run_workflow.call_count == 2
+    tailor.analyze_job_description.assert_called_once()
+
+# Tests for watcher.py
+from watcher import JobDescriptionWatcher, PollingWatcher, InotifyWatcher
+from models import BatchRecord
+
+def _fake_tailor():
+    tailor = MagicMock()
+    tailor.run_job.side_effect = lambda resume, jd, out: BatchRecord(jd_path=jd, output_path=out, status="ok", best_score=91, elapsed_seconds=0.1, finished_at="2026-01-01T00:00:00+00:00")
+    return tailor
+
+def test_watcher_debounces_and_skips_processed_content(tmp_path):
+    """Files are queued only after the debounce period, and identical content is processed once."""
+    incoming = tmp_path / "incoming"
+    incoming.mkdir()
+    jd = incoming / "job_description_acme.txt"
+    jd.write_text("Job description text.")
+    (incoming / "notes.txt").write_text("Not a job description.")
+    factory = MagicMock(side_effect=_fake_tailor)
+    watcher = JobDescriptionWatcher(str(incoming), "resume.txt", factory, output_dir=str(tmp_path / "out"),
+                                    results_path=str(tmp_path / "results.jsonl"), debounce=2.0, max_workers=1)
+
+    with watcher:
+        watcher.handle_events([str(jd), str(incoming / "notes.txt")], now=10.0)
+        assert watcher.dispatch_ready(now=11.0) == []
+        futures = watcher.dispatch_ready(now=12.5)
+        assert len(futures) == 1
+        assert futures[0].result().status == "ok"
+
+        copy = incoming / "job_description_acme_copy.txt"
+        copy.write_text("Job description text.")
+        watcher.handle_events([str(copy)], now=20.0)
+        assert watcher.dispatch_ready(now=30.0) == []
+
+    assert [r.jd_path for r in read_results(str(tmp_path / "results.jsonl"))] == [str(jd)]
+    reloaded = JobDescriptionWatcher(str(incoming), "resume.txt", factory, output_dir=str(tmp_path / "out"))
+    assert len(reloaded.processed) == 1
+
+def test_watcher_queues_identical_content_once_per_tick(tmp_path):
+    """Two files with the same content ready together are tailored once."""
+    incoming = tmp_path / "incoming"
+    incoming.mkdir()
+    paths = [incoming / f"job_description_{name}.txt" for name in ("a", "b")]
+    for path in paths:
+        path.write_text("Job description text.")
+    release = threading.Event()
+
+    def slow_tailor():
+        tailor = _fake_tailor()
+        record = tailor.run_job.side_effect
+        tailor.run_job.side_effect = lambda *args: release.wait(5) and record(*args)
+        return tailor
+
+    watcher = JobDescriptionWatcher(str(incoming), "resume.txt", MagicMock(side_effect=slow_tailor),
+                                    output_dir=str(tmp_path / "out"), results_path=str(tmp_path / "results.jsonl"),
+                                    debounce=1.0, max_workers=2)
+
+    with watcher:
+        watcher.handle_events([str(path) for path in paths], now=0.0)
+        futures = watcher.dispatch_ready(now=5.0)
+        release.set()
+        assert len(futures) == 1
+        futures[0].result()
+    assert watcher.in_flight_digests == set()
+
+def test_watcher_drops_files_that_vanish_before_hashing(tmp_path):
+    """A file removed between its event and dispatch does not stop the watcher."""
+    incoming = tmp_path / "incoming"
+    incoming.mkdir()
+    jd = incoming / "job_description_gone.txt"
+    jd.write_text("Job description text.")
+    watcher = JobDescriptionWatcher(str(incoming), "resume.txt", MagicMock(side_effect=_fake_tailor),
+                                    output_dir=str(tmp_path / "out"), results_path=str(tmp_path / "results.jsonl"))
+
+    with watcher, patch('watcher.file_hash', side_effect=FileNotFoundError(str(jd))):
+        watcher.handle_events([str(jd)], now=0.0)
+        assert watcher.dispatch_ready(now=5.0) == []
+    assert watcher.pending == {}
+
+def test_polling_watcher_detects_changes(tmp_path):
+    """The polling fallback reports new and modified files."""
+    watcher = PollingWatcher(str(tmp_path))
+    assert watcher.poll(0) == []
+    (tmp_path / "job_description_new.txt").write_text("Job")
+    assert watcher.poll(0) == [str(tmp_path / "job_description_new.txt")]
+
+def test_inotify_watcher_detects_changes(tmp_path):
+    """inotify reports files written into the watched directory."""
+    try:
+        watcher = InotifyWatcher(str(tmp_path))
+    except OSError:
+        pytest.skip("inotify not available")
+    try:
+        (tmp_path / "job_description_new.txt").write_text("Job")
+        assert str(tmp_path / "job_description_new.txt") in watcher.poll(1.0)
+    finally:
+        watcher.close()
+
+# Tests for artifact_store.py
+from artifact_store import ArtifactStore, split_chunks
+
+def test_artifact_store_roundtrip_and_dedup(tmp_path):
+    """Drafts are reconstructed exactly and shared sections are stored once."""
+    store = ArtifactStore(str(tmp_path / "store"))
+    first = "# Jane Doe\n\n## Summary\nEngineer.\n\n## Experience\n- Built things\n"
+    second = first.replace("Engineer.", "QA engineer.")
+
+    first_hash = store.put_markdown(first)
+    objects_after_first = store.stats()["objects"]
+    store.put_markdown(second)
+    assert store.get_markdown(first_hash) == first
+    assert "".join(split_chunks(second)) == second
+    assert store.stats()["objects"] == objects_after_first + 2  # Changed section + recipe
+
+def test_artifact_store_find_versions(tmp_path):
+    """Versions can be queried by job description, score and date."""
+    store = ArtifactStore(str(tmp_path / "store"))
+    store.record_version("jobs/job_description_acme.txt", "Acme JD", "# Draft A", 72)
+    store.record_version("jobs/job_description_globex.txt", "Globex JD", "# Draft B", 91)
+
+    assert [v.score for v in store.find_versions(jd="acme")] == [72]
+    assert [v.jd_path for v in store.find_versions(min_score=90)] == ["jobs/job_description_globex.txt"]
+    assert len(store.find_versions(since="2000-01-01")) == 2
+    assert store.find_versions(until="2000-01-01") == []
+    assert store.get_version(1).score == 72
+
+def test_generate_pdf_reuses_stored_pdf(resume_tailor_instance, tmp_path):
+    """Identical Markdown is served from the store instead of being rendered again."""
+    resume_tailor_instance.artifact_store = ArtifactStore(str(tmp_path / "store"))
+    render = lambda md, path, stylesheet: open(path, "wb").write(b"%PDF-" + md.encode())
+
+    with patch('resume_tailor.render_pdf', side_effect=render) as mock_render:
+        resume_tailor_instance.generate_pdf("# Test Resume", str(tmp_path / "first.pdf"))
+        resume_tailor_instance.generate_pdf("# Test Resume", str(tmp_path / "second.pdf"))
+    mock_render.assert_called_once()
+    assert (tmp_path / "second.pdf").read_bytes() == b"%PDF-# Test Resume"
+
 # Tests for example_usage.py
 import os
 from unittest.mock import patch, MagicMock
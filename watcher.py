@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Watch a directory and tailor the resume for every new job description dropped into it
+
+Uses inotify on Linux and falls back to polling elsewhere. Files are only picked up once
+they have been quiet for a debounce period, so partially written files are not processed.
+Jobs run on a bounded thread pool, results stream to a JSONL file, and job descriptions
+whose content was already processed are skipped.
+"""
+
+import os
+import json
+import time
+import errno
+import fnmatch
+import hashlib
+import select
+import struct
+import argparse
+import threading
+import ctypes
+import ctypes.util
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from result_sink import JsonlResultWriter
+from resume_tailor import ResumeTailor, job_output_path
+
+DEFAULT_PATTERN = "job_description_*.txt"
+
+
+class InotifyWatcher:
+    """Reports files created, written or moved into a directory via Linux inotify."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    _EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+
+    def poll(self, timeout: float) -> List[str]:
+        """Paths with events in the next ``timeout`` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths, offset = [], 0
+        while offset + self._EVENT.size <= len(data):
+            _, _, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                paths.append(os.path.join(self.directory, os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Reports files whose size or modification time changed since the last scan."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> List[str]:
+        time.sleep(timeout)
+        snapshot = self._scan()
+        changed = [path for path, sig in snapshot.items() if self._snapshot.get(path) != sig]
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory: str, use_inotify: bool = True):
+    """inotify when available, polling otherwise."""
+    if use_inotify:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(directory)
+
+
+def file_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class JobDescriptionWatcher:
+    """Debounces file events and tailors each new or changed job description once."""
+
+    def __init__(self, directory: str, resume_path: str, tailor_factory: Callable,
+                 output_dir: str = ".", results_path: str = "results.jsonl",
+                 pattern: str = DEFAULT_PATTERN, debounce: float = 2.0, max_workers: int = 2,
+                 state_path: Optional[str] = None, use_inotify: bool = True):
+        self.directory = directory
+        self.resume_path = resume_path
+        self.tailor_factory = tailor_factory
+        self.output_dir = output_dir
+        self.results_path = results_path
+        self.pattern = pattern
+        self.debounce = debounce
+        self.max_workers = max_workers
+        self.state_path = state_path or os.path.join(output_dir, ".watch_state.json")
+        self.use_inotify = use_inotify
+
+        self.pending: Dict[str, float] = {}
+        self.in_flight = set()
+        self.in_flight_digests = set()
+        self.processed: Dict[str, dict] = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r') as f:
+                self.processed = json.load(f)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+        self._writer = None
+
+    def __enter__(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tailor")
+        self._writer = JsonlResultWriter(self.results_path).__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._executor.shutdown(wait=True)
+        self._writer.close()
+
+    def handle_events(self, paths: List[str], now: Optional[float] = None):
+        """Mark matching paths as pending; each new event restarts the debounce timer."""
+        now = time.monotonic() if now is None else now
+        for path in paths:
+            if fnmatch.fnmatch(os.path.basename(path), self.pattern):
+                self.pending[path] = now
+
+    def dispatch_ready(self, now: Optional[float] = None) -> list:
+        """Queue pending files that have been quiet for the debounce period."""
+        now = time.monotonic() if now is None else now
+        futures = []
+        for path, last_event in list(self.pending.items()):
+            if now - last_event < self.debounce:
+                continue
+            with self._lock:
+                if path in self.in_flight:
+                    continue  # Picked up again once the running job finishes
+                del self.pending[path]
+                try:
+                    digest = file_hash(path)
+                except OSError:
+                    continue  # Moved or deleted since the event
+                if digest in self.processed:
+                    print(f"⏭️  Skipping {path} (already processed as {self.processed[digest]['jd_path']})")
+                    continue
+                if digest in self.in_flight_digests:
+                    print(f"⏭️  Skipping {path} (same content is already queued)")
+                    continue
+                self.in_flight.add(path)
+                self.in_flight_digests.add(digest)
+            print(f"📥 Queued {path}")
+            futures.append(self._executor.submit(self._process, path, digest))
+        return futures
+
+    def _tailor(self):
+        """One ResumeTailor per worker thread, since it tracks per-run state."""
+        if not hasattr(self._local, "tailor"):
+            self._local.tailor = self.tailor_factory()
+        return self._local.tailor
+
+    def _process(self, path: str, digest: str):
+        try:
+            record = self._tailor().run_job(self.resume_path, path, job_output_path(path, self.output_dir))
+            with self._lock:
+                self._writer.write(record)
+                if record.status == "ok":
+                    self.processed[digest] = {
+                        "jd_path": path,
+                        "output_path": record.output_path,
+                        "processed_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                    self._save_state()
+            print(f"✅ {path}: {record.status} (score {record.best_score})")
+            return record
+        finally:
+            with self._lock:
+                self.in_flight.discard(path)
+                self.in_flight_digests.discard(digest)
+
+    def _save_state(self):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.processed, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def run(self, stop_event: Optional[threading.Event] = None):
+        """Process existing files, then watch until ``stop_event`` is set or Ctrl+C."""
+        stop_event = stop_event or threading.Event()
+        backend = open_watcher(self.directory, self.use_inotify)
+        print(f"👀 Watching {self.directory} for {self.pattern} ({type(backend).__name__})")
+        self.handle_events([os.path.join(self.directory, name) for name in os.listdir(self.directory)], now=0.0)
+        try:
+            with self:
+                while not stop_event.is_set():
+                    self.dispatch_ready()
+                    self.handle_events(backend.poll(min(self.debounce / 2, 1.0)))
+        finally:
+            backend.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tailor the resume for job descriptions dropped into a directory")
+    parser.add_argument("resume", help="Path to master resume (.pdf or .txt)")
+    parser.add_argument("directory", help="Directory to watch")
+    parser.add_argument("--output-dir", default=".", help="Directory for tailored PDFs")
+    parser.add_argument("--results", default="results.jsonl", help="JSONL results file")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help="Filename pattern to process")
+    parser.add_argument("--debounce", type=float, default=2.0, help="Seconds a file must be quiet before processing")
+    parser.add_argument("--workers", type=int, default=2, help="Maximum concurrent tailoring jobs")
+    parser.add_argument("--poll", action="store_true", help="Use polling instead of inotify")
+
+    args = parser.parse_args()
+
+    watcher = JobDescriptionWatcher(
+        args.directory, args.resume, ResumeTailor,
+        output_dir=args.output_dir,
+        results_path=args.results,
+        pattern=args.pattern,
+        debounce=args.debounce,
+        max_workers=args.workers,
+        use_inotify=not args.poll,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")